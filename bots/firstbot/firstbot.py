@@ -9,6 +9,12 @@ from lib.gameplayer import GamePlayer
 class FirstBot(GamePlayer):
     """Do the first possible move every time."""
 
+    def __init__(self) -> None:
+        """Create new FirstBot object."""
+        super().__init__()
+        self.deterministic = True
+        return
+
     def process(self, inputs: List[float], available_moves: List[float]) -> float:
         """Process one game turn."""
         return available_moves[0]
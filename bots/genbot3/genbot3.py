@@ -4,6 +4,8 @@
 import random
 from typing import Any, Dict, List
 
+import numpy as np
+
 from lib.gameplayer import GamePlayer
 from bots.genbot3 import nodes
 
@@ -15,6 +17,8 @@ class GenBot3(GamePlayer):
         """Create new GenBot3."""
         super().__init__()
         self.genetic = True
+        self.deterministic = True
+        self.batch_native = True
         self.nodes = []
         self.output_nodes = []
         return
@@ -164,3 +168,34 @@ class GenBot3(GamePlayer):
 
         return selected_move
         # END OF BRAIN ENGAGEMENT
+
+    def process_batch(self, inputs: np.ndarray, legal_mask: np.ndarray) -> np.ndarray:
+        """Process one game turn for many games at once."""
+        # Each node's output for every game, keyed by id(node).
+        values = {}
+        num_inputs = inputs.shape[1]
+        for p in range(num_inputs):
+            values[id(self.nodes[p])] = inputs[:, p] != 0
+
+        # ENGAGE BRAIN.
+        for node in self.nodes[num_inputs:]:
+            values[id(node)] = node.process_batch(self.get_batch_inputs(node, values, len(inputs)))
+
+        outputs = np.stack(
+            [
+                node.process_batch(self.get_batch_inputs(node, values, len(inputs)))
+                for node in self.output_nodes
+            ],
+            axis=1,
+        )
+
+        # Highest output wins. Ties go to the lowest move, as in process().
+        outputs = np.where(legal_mask, outputs, -1)
+        return outputs.argmax(axis=1)
+
+    @staticmethod
+    def get_batch_inputs(node, values, num_games):
+        """Get the input values of a node for process_batch()."""
+        # A node that has been replaced by mutate() is no longer updated, so
+        # process() sees its last output for every game.
+        return [values.get(id(x), np.full(num_games, bool(x.output))) for x in node.input_nodes]
@@ -1,5 +1,7 @@
 """Base brain node class."""
 
+import numpy as np
+
 
 class NodeBase:
     """Base class for brain nodes."""
@@ -21,6 +23,10 @@ class NodeBase:
         """Process this node, given the specified inputs."""
         return 1
 
+    def process_batch(self, inputs):
+        """Process this node for many games at once, given one boolean array per input."""
+        return np.ones(len(inputs[0]), dtype=bool)
+
     def update(self):
         """Process this node."""
         inputs = []
@@ -5,6 +5,8 @@ These are basically all of the standard boolean logic operators.
 The higher-level 'emergent' behaviour stems from combinations of these nodes.
 """
 
+import numpy as np
+
 from bots.genbot3.nodebase import NodeBase, NodeBase2
 
 
@@ -31,6 +33,10 @@ class NODE_NOT(NodeBase):
         """Process this node."""
         return not inputs[0]
 
+    def process_batch(self, inputs):
+        """Process this node for many games at once."""
+        return ~inputs[0]
+
 
 class NODE_AND(NodeBase2):
     """NODE_AND: return 1 if both inputs are 1."""
@@ -39,6 +45,10 @@ class NODE_AND(NodeBase2):
         """Process this node."""
         return inputs[0] and inputs[1]
 
+    def process_batch(self, inputs):
+        """Process this node for many games at once."""
+        return inputs[0] & inputs[1]
+
 
 class NODE_OR(NodeBase2):
     """NODE OR: return 1 if either input is 1."""
@@ -47,6 +57,10 @@ class NODE_OR(NodeBase2):
         """Process this node."""
         return inputs[0] or inputs[1]
 
+    def process_batch(self, inputs):
+        """Process this node for many games at once."""
+        return inputs[0] | inputs[1]
+
 
 class NODE_XOR(NodeBase2):
     """NODE XOR: return 1 if either input is 1 but not both."""
@@ -58,6 +72,10 @@ class NODE_XOR(NodeBase2):
 
         return inputs[0] or inputs[1]
 
+    def process_batch(self, inputs):
+        """Process this node for many games at once."""
+        return inputs[0] ^ inputs[1]
+
 
 class NODE_NAND(NodeBase2):
     """NODE NAND: return 1 if either input is 0, otherwise 0."""
@@ -69,6 +87,10 @@ class NODE_NAND(NodeBase2):
 
         return 1
 
+    def process_batch(self, inputs):
+        """Process this node for many games at once."""
+        return ~(inputs[0] & inputs[1])
+
 
 class NODE_NOR(NodeBase2):
     """NODE NOR: return 1 if both inputs are 0, otherwise 0."""
@@ -80,6 +102,10 @@ class NODE_NOR(NodeBase2):
 
         return 1
 
+    def process_batch(self, inputs):
+        """Process this node for many games at once."""
+        return ~(inputs[0] | inputs[1])
+
 
 class NODE_XNOR(NodeBase2):
     """NODE XNOR: return 1 if both inputs are equal, otherwise 0."""
@@ -94,6 +120,10 @@ class NODE_XNOR(NodeBase2):
 
         return 1
 
+    def process_batch(self, inputs):
+        """Process this node for many games at once."""
+        return ~(inputs[0] ^ inputs[1])
+
 
 class NODE_OUTPUT(NodeBase):
     """
@@ -116,3 +146,7 @@ class NODE_OUTPUT(NodeBase):
             total += i
 
         return total
+
+    def process_batch(self, inputs):
+        """Process this node for many games at once."""
+        return np.sum(inputs, axis=0, dtype=np.int64)
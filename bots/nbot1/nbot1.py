@@ -5,6 +5,8 @@ import os
 import random
 from typing import Any, Dict, List
 
+import numpy as np
+
 from lib.gameplayer import GamePlayer
 from .neurons import InputNeuron, Neuron, NeuronLayer, sigmoid
 
@@ -16,6 +18,8 @@ class NBot1(GamePlayer):
         """Create new NBOT1."""
         super().__init__()
         self.genetic = True
+        self.deterministic = True
+        self.batch_native = True
         self.input_nodes = []
         self.layers = []
         self.nodes_per_layer = 9
@@ -127,3 +131,15 @@ class NBot1(GamePlayer):
         selected_move = int(sorted_moves[0])
 
         return selected_move
+
+    def process_batch(self, inputs: np.ndarray, legal_mask: np.ndarray) -> np.ndarray:
+        """Process one game turn for many games at once, using one weight matrix per layer."""
+        values = inputs
+        for layer in self.layers:
+            weights = np.array([node.input_weights for node in layer.nodes], dtype=np.float64)
+            biases = np.array([node.bias for node in layer.nodes], dtype=np.float64)
+            values = 1.0 / (1.0 + np.exp(-(values @ weights.T + biases)))
+
+        # Highest output wins. Ties go to the lowest move, as in process().
+        values = np.where(legal_mask, values, -np.inf)
+        return values.argmax(axis=1)
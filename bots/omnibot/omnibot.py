@@ -18,6 +18,9 @@ class OmniBot(GamePlayer):
         """Create new OmniBot object."""
         super().__init__()
         self.magic = True
+
+        # Every move is played, so symmetric positions are always played symmetrically.
+        self.symmetric = True
         return
 
     def process_magic(self, inputs: List[float], available_moves: List[float]) -> List[float]:
@@ -8,6 +8,7 @@ It is also very useful for training and testing AI bots.
 import random
 from typing import List
 
+import numpy as np
 
 from lib.gameplayer import GamePlayer
 
@@ -15,7 +16,28 @@ from lib.gameplayer import GamePlayer
 class RandomBot(GamePlayer):
     """Do random move from possible moves only."""
 
+    def __init__(self) -> None:
+        """Create new RandomBot object."""
+        super().__init__()
+        self.batch_native = True
+        # Seed from the random module, so seeding that also seeds process_batch().
+        self.rng = np.random.default_rng(random.getrandbits(64))
+        return
+
+    def reset_for_game(self) -> None:
+        """Reseed process_batch() from the random module, which may have been reseeded."""
+        super().reset_for_game()
+        self.rng = np.random.default_rng(random.getrandbits(64))
+        return
+
     def process(self, inputs: List[float], available_moves: List[float]) -> float:
         """Process one game turn."""
         return random.choice(available_moves)
 
+    def process_batch(self, inputs: np.ndarray, legal_mask: np.ndarray) -> np.ndarray:
+        """Process one game turn for many games at once."""
+        # Give every move a random key. Illegal moves can never have the
+        # highest key, so the highest key is a uniform choice of legal move.
+        keys = self.rng.random(legal_mask.shape)
+        keys[~legal_mask] = -1.0
+        return keys.argmax(axis=1)
@@ -6,6 +6,7 @@ import random
 import time
 from typing import Optional
 
+from lib import registry
 from lib.errors import BotCreateError, GameCreateError
 from lib.gameconfig import GameConfig, quit_game
 from lib.runners import singlerunner, batchrunner, geneticrunner
@@ -15,6 +16,7 @@ from lib.runners.gamerunnerbase import GameRunnerBase
 if __name__ == "__main__":
     base_dir = os.path.abspath(os.path.dirname(__file__))
     config = GameConfig(base_path=base_dir)
+    registry.load_manifest()
     print("Started")
 
     try:
@@ -50,7 +50,3 @@ class Connect4Bot(GamePlayer):
     def do_turn(self, current_world: World) -> int:
         """Do one turn. Override in subclass."""
         return 0
-
-    def show_result(self, data: Any) -> None:
-        """Allow bot to see final result."""
-        return
@@ -1,9 +1,10 @@
 """Module for running a single game of Connect 4."""
 
 
-from typing import Any, Dict, List, Optional, Tuple
+from array import array
+from typing import Any, Dict, Optional, Sequence, Tuple
 
-from games.connect4.world import World
+from games.connect4.world import COL_STRIDE, WIDTH, World, mirror_bits
 from lib.gamebase import GameBase
 from lib.gameresult import GameResult
 
@@ -14,6 +15,7 @@ class SingleGame(GameBase):
     identities = ("X", "O")
     input_count = 98  # 49 for each player.
     output_count = 7
+    max_score = 21.0  # Best possible score: a win in 4 turns.
 
     def __init__(self) -> None:
         """Create a new SingleGame object."""
@@ -37,29 +39,27 @@ class SingleGame(GameBase):
         assert self.world, "World not loaded"
         return {"world": self.world.to_dict()}
 
-    def get_inputs(self, identity: str) -> Tuple[List[float], List[float]]:
-        """Convert current game state into a list of player-specific inputs."""
-        assert self.world, "World not loaded"
-        inputs = []
-        for row in range(7):
-            for col in range(7):
-                c = self.world.getat(col, row)
-                if c == identity:
-                    inputs.append(1.0)
-                else:
-                    inputs.append(0.0)
+    def fill_inputs(self, identity: str, buffer: array) -> None:
+        """Write the full set of player-specific inputs into the buffer."""
+        if not self.world:
+            # The world is not loaded yet, e.g. set_initial_state() was not called.
+            return
 
         for row in range(7):
             for col in range(7):
                 c = self.world.getat(col, row)
-                if c == identity or c == " ":
-                    inputs.append(0.0)
-                else:
-                    inputs.append(1.0)
-        return inputs, self.world.get_possible_moves()
-
-    def update(self, identity: str, output: float) -> None:
-        """Assign closest valid move to this bot."""
+                index = row * 7 + col
+                buffer[index] = 1.0 if c == identity else 0.0
+                buffer[index + 49] = 0.0 if c == identity or c == " " else 1.0
+        return
+
+    def get_inputs(self, identity: str) -> Tuple[Sequence[float], Sequence[float]]:
+        """Get the player-specific inputs and the available moves."""
+        assert self.world, "World not loaded"
+        return self.get_input_view(identity), self.world.get_possible_moves()
+
+    def update(self, identity: str, output: float) -> int:
+        """Assign closest valid move to this bot, and return the move."""
         assert self.world, "World not loaded"
         # TODO: The next step is to abort games if a bot returned an invalid move.
         #       This will force bots to learn the game rules first.
@@ -79,6 +79,29 @@ class SingleGame(GameBase):
 
         assert target_move is not None, "BUG: update() failed to select target move!"
         self.world.setat(target_move, identity)
+
+        # Update the input buffers in place. Inputs 0-48 are our positions,
+        # and inputs 49-97 are the opponent's positions.
+        assert self.world.last_move, "BUG: Last move not recorded!"
+        col, row = self.world.last_move
+        index = row * 7 + col
+        for other_identity in self.identities:
+            if other_identity == identity:
+                self.set_input(other_identity, index, 1.0)
+            else:
+                self.set_input(other_identity, index + 49, 1.0)
+        return target_move
+
+    def undo_update(self, identity: str, move: int) -> None:
+        """Revert the move returned by update()."""
+        assert self.world, "World not loaded"
+        index = (self.world.heights[move] - 1) * 7 + move
+        self.world.unsetat(move)
+        for other_identity in self.identities:
+            if other_identity == identity:
+                self.set_input(other_identity, index, 0.0)
+            else:
+                self.set_input(other_identity, index + 49, 0.0)
         return
 
     def is_ended(self) -> bool:
@@ -89,8 +112,7 @@ class SingleGame(GameBase):
     def get_result(self) -> GameResult:
         """Process and return game result."""
         assert self.world, "World not loaded"
-        for bot in self.bots:
-            bot.show_result(self.world)
+        self.show_result()
 
         result = GameResult()
 
@@ -117,6 +139,48 @@ class SingleGame(GameBase):
 
         return result
 
+    def get_position_key(self) -> int:
+        """Get a key identifying the current position: both bitboards and the side to move."""
+        assert self.world, "World not loaded"
+        bits = WIDTH * COL_STRIDE
+        world = self.world
+        return world.x_bits | (world.o_bits << bits) | (self.current_bot_index << (2 * bits))
+
+    def set_position_key(self, key: int) -> None:
+        """Restore the position from a key returned by get_position_key()."""
+        bits = WIDTH * COL_STRIDE
+        mask = (1 << bits) - 1
+        self.world = World()
+        self.world.set_bits(key & mask, (key >> bits) & mask)
+        self.current_bot_index = key >> (2 * bits)
+        self.num_turns = {
+            "X": bin(self.world.x_bits).count("1"),
+            "O": bin(self.world.o_bits).count("1"),
+        }
+        self.move_stack = []
+        self.refresh_inputs()
+        return
+
+    def get_canonical_key(self) -> int:
+        """Get the smaller position key of the world and its mirror image."""
+        assert self.world, "World not loaded"
+        bits = WIDTH * COL_STRIDE
+        world = self.world
+        mirrored = mirror_bits(world.x_bits) | (mirror_bits(world.o_bits) << bits)
+        key = min(world.x_bits | (world.o_bits << bits), mirrored)
+        return key | (self.current_bot_index << (2 * bits))
+
+    def get_outcome(self) -> int:
+        """Get the outcome of a finished game: 1 for an X win, 2 for an O win, or 3 for a draw."""
+        assert self.world, "World not loaded"
+        return self.world.get_game_state()
+
+    def show_result(self) -> None:
+        """Allow every bot to see the final world."""
+        for bot in self.bots:
+            bot.show_result(self.world)
+        return
+
     def calculate_score(self, num_turns: int, outcome: int) -> float:
         """
         Calculate the 'score' for this game.
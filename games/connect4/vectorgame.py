@@ -0,0 +1,86 @@
+"""
+Module for running many games of Connect 4 in lockstep.
+
+Worlds are stored as a single (num_games, 7, 7) int8 array, indexed by
+[game, row, col] with row 0 at the bottom. Each cell is 0 for a blank space,
+1 for X or 2 for O. The height of every column is kept in a separate
+(num_games, 7) array.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from games.connect4.world import HEIGHT, WIDTH, World
+from lib.batch import DRAW
+from lib.vectorgamebase import VectorGameBase
+
+
+def has_four(pieces: np.ndarray) -> np.ndarray:
+    """
+    Check for four in a row, in every game at once.
+
+    :param pieces: (num_games, HEIGHT, WIDTH) boolean array of one player's pieces.
+    :returns: Boolean array, True for every game containing four in a row.
+    """
+    # Each slice is the board shifted by n cells in one direction. ANDing four
+    # consecutive shifts leaves a cell set only if it starts a line of four.
+    horizontal = pieces[:, :, 0:-3] & pieces[:, :, 1:-2] & pieces[:, :, 2:-1] & pieces[:, :, 3:]
+    vertical = pieces[:, 0:-3, :] & pieces[:, 1:-2, :] & pieces[:, 2:-1, :] & pieces[:, 3:, :]
+    diagonal_up = (
+        pieces[:, 0:-3, 0:-3] & pieces[:, 1:-2, 1:-2] & pieces[:, 2:-1, 2:-1] & pieces[:, 3:, 3:]
+    )
+    diagonal_down = (
+        pieces[:, 3:, 0:-3] & pieces[:, 2:-1, 1:-2] & pieces[:, 1:-2, 2:-1] & pieces[:, 0:-3, 3:]
+    )
+    return (
+        horizontal.any(axis=(1, 2))
+        | vertical.any(axis=(1, 2))
+        | diagonal_up.any(axis=(1, 2))
+        | diagonal_down.any(axis=(1, 2))
+    )
+
+
+class VectorGame(VectorGameBase):
+    """Run many games of Connect 4 in lockstep."""
+
+    identities = ("X", "O")
+    input_count = 98  # 49 for each player.
+    output_count = 7
+
+    def __init__(self, num_games: int, common_random: bool = False) -> None:
+        """Create a new VectorGame object."""
+        super().__init__(num_games, common_random)
+        self.worlds = np.zeros((num_games, HEIGHT, WIDTH), dtype=np.int8)
+        self.heights = np.zeros((num_games, WIDTH), dtype=np.int8)
+        return
+
+    def get_inputs(self, active: np.ndarray, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the inputs and legal moves for the specified games."""
+        # Input (row * 7 + col) is our piece, and (49 + row * 7 + col) is theirs.
+        worlds = self.worlds[active].reshape(len(active), HEIGHT * WIDTH)
+        ours = worlds == index + 1
+        theirs = (worlds != 0) & ~ours
+        inputs = np.concatenate([ours, theirs], axis=1).astype(np.float64)
+        return inputs, self.heights[active] < HEIGHT
+
+    def update(self, active: np.ndarray, index: int, moves: np.ndarray) -> None:
+        """Apply moves to the specified games, and update the outcomes."""
+        piece = index + 1
+        rows = self.heights[active, moves]
+        self.worlds[active, rows, moves] = piece
+        self.heights[active, moves] += 1
+
+        # Only the player who just moved can have won.
+        won = has_four(self.worlds[active] == piece)
+        full = (self.heights[active] == HEIGHT).all(axis=1)
+
+        self.outcomes[active[won]] = piece
+        self.outcomes[active[full & ~won]] = DRAW
+        return
+
+    def get_result_data(self, game_index: int) -> World:
+        """Get the final world of the specified game."""
+        world = World()
+        world.data = ["".join(" XO"[x] for x in row) for row in self.worlds[game_index]]
+        return world
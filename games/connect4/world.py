@@ -1,22 +1,132 @@
 """
 The World class provides a representation of a Connect 4 stand.
 
-It consists of 7 rows of 7-character strings.
-Each character in a string can be blank, or contain 'X' or 'O'.
+Internally the stand is stored as two bitboards, one for X and one for O.
+Each column uses 8 bits (7 rows plus one empty sentinel bit on top), so
+bit (col * 8 + row) is set if the player occupies that cell. The sentinel
+bits stop four-in-a-row checks from wrapping between columns.
+
+The string form is still available via the 'data' property, and is used for
+serialisation. It consists of 7 rows of 7-character strings (row 0 is the
+bottom row). Each character in a string can be blank, or contain 'X' or 'O'.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 
-NEW_WORLD = ["       " for _ in range(7)]
+WIDTH = 7
+HEIGHT = 7
+
+# Number of bits per column, including the sentinel bit.
+COL_STRIDE = HEIGHT + 1
+assert COL_STRIDE == 8, "mirror_bits() assumes one byte per column"
+
+NEW_WORLD = [" " * WIDTH for _ in range(HEIGHT)]
+
+# Bitmask with the top (playable) cell of every column set.
+TOP_MASK = sum(1 << (col * COL_STRIDE + HEIGHT - 1) for col in range(WIDTH))
+
+# Shifts for each direction: vertical, horizontal, and both diagonals.
+DIRECTION_SHIFTS = (1, COL_STRIDE, COL_STRIDE - 1, COL_STRIDE + 1)
+
+
+def _get_windows() -> List[List[int]]:
+    """Get the masks of every 4-cell window, indexed by each bit they contain."""
+    windows = [[] for _ in range(WIDTH * COL_STRIDE)]  # type: List[List[int]]
+    for col in range(WIDTH):
+        for row in range(HEIGHT):
+            for dcol, drow in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_col = col + 3 * dcol
+                end_row = row + 3 * drow
+                if not (0 <= end_col < WIDTH and 0 <= end_row < HEIGHT):
+                    continue
+
+                cells = [(col + n * dcol) * COL_STRIDE + row + n * drow for n in range(4)]
+                mask = sum(1 << cell for cell in cells)
+                for cell in cells:
+                    windows[cell].append(mask)
+    return windows
+
+
+# WINDOWS[bit_index] lists every four-in-a-row mask that passes through that cell.
+WINDOWS = _get_windows()
+
+
+def has_four(bits: int) -> bool:
+    """Return True if the specified bitboard contains four in a row."""
+    for shift in DIRECTION_SHIFTS:
+        pairs = bits & (bits >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def mirror_bits(bits: int) -> int:
+    """Mirror the specified bitboard left to right."""
+    # Each column is exactly one byte, so mirroring reverses the byte order.
+    return int.from_bytes(bits.to_bytes(WIDTH, "little"), "big")
 
 
 class World:
     """Representation of a Connect 4 stand."""
 
+    __slots__ = ("x_bits", "o_bits", "heights", "num_pieces", "last_move", "_state")
+
     def __init__(self) -> None:
         """Create a new World object."""
-        self.data = list(NEW_WORLD)
+        self.x_bits = 0
+        self.o_bits = 0
+        self.heights = [0] * WIDTH
+        self.num_pieces = 0
+
+        # The (col, row) of the last piece dropped with setat(), if any.
+        self.last_move = None  # type: Optional[Tuple[int, int]]
+
+        # Cached game state. None means it must be recalculated from scratch.
+        self._state = 0  # type: Optional[int]
+        return
+
+    @property
+    def data(self) -> List[str]:
+        """Get the world as a list of 7 strings, bottom row first."""
+        rows = []
+        for row in range(HEIGHT):
+            rows.append("".join([self.getat(col, row) for col in range(WIDTH)]))
+        return rows
+
+    @data.setter
+    def data(self, value: List[str]) -> None:
+        """Set the world from a list of 7 strings, bottom row first."""
+        assert len(value) == HEIGHT, "Invalid number of rows: {}".format(len(value))
+        self.x_bits = 0
+        self.o_bits = 0
+        for row, row_str in enumerate(value):
+            assert len(row_str) == WIDTH, "Invalid row length: '{}'".format(row_str)
+            for col, c in enumerate(row_str):
+                if c == "X":
+                    self.x_bits |= 1 << (col * COL_STRIDE + row)
+                elif c == "O":
+                    self.o_bits |= 1 << (col * COL_STRIDE + row)
+        self.set_bits(self.x_bits, self.o_bits)
+        return
+
+    def set_bits(self, x_bits: int, o_bits: int) -> None:
+        """Set the world directly from both bitboards."""
+        self.x_bits = x_bits
+        self.o_bits = o_bits
+        self.update_heights()
+        self.num_pieces = bin(x_bits | o_bits).count("1")
+        self.last_move = None
+        self._state = None
+        return
+
+    def update_heights(self) -> None:
+        """Recalculate the column heights from the bitboards."""
+        occupied = self.x_bits | self.o_bits
+        column_mask = (1 << HEIGHT) - 1
+        self.heights = [
+            ((occupied >> (col * COL_STRIDE)) & column_mask).bit_length() for col in range(WIDTH)
+        ]
         return
 
     def to_dict(self) -> Dict[str, Any]:
@@ -31,7 +141,12 @@ class World:
     def copy(self) -> "World":
         """Clone this World instance."""
         b = World()
-        b.data = self.data
+        b.x_bits = self.x_bits
+        b.o_bits = self.o_bits
+        b.heights = list(self.heights)
+        b.num_pieces = self.num_pieces
+        b.last_move = self.last_move
+        b._state = self._state
         return b
 
     def getat(self, col: int, row: int) -> str:
@@ -43,16 +158,39 @@ class World:
 
         :returns: Character at the specified position. One of 'X', 'O', or ' '.
         """
-        return self.data[int(row)][int(col)]
+        bit = 1 << (int(col) * COL_STRIDE + int(row))
+        if self.x_bits & bit:
+            return "X"
+        if self.o_bits & bit:
+            return "O"
+        return " "
 
     def setat_raw(self, col: int, row: int, turn: str) -> None:
         """Set the character at the specified position, without gravity."""
-        newrow = list(self.data[int(row)])
-        newrow[int(col)] = turn
-        newrow_str = "".join(newrow)
-
-        assert len(newrow_str) == 7, "Invalid row length after set!"
-        self.data[int(row)] = newrow_str
+        col = int(col)
+        row = int(row)
+        assert 0 <= col < WIDTH and 0 <= row < HEIGHT, "Invalid position {},{}".format(col, row)
+        bit = 1 << (col * COL_STRIDE + row)
+        if (self.x_bits | self.o_bits) & bit:
+            self.num_pieces -= 1
+
+        self.x_bits &= ~bit
+        self.o_bits &= ~bit
+        if turn == "X":
+            self.x_bits |= bit
+            self.num_pieces += 1
+        elif turn == "O":
+            self.o_bits |= bit
+            self.num_pieces += 1
+
+        if turn != " " and row >= self.heights[col]:
+            self.heights[col] = row + 1
+        elif turn == " " and row < self.heights[col]:
+            self.update_heights()
+
+        # Arbitrary edits invalidate the incremental state.
+        self.last_move = None
+        self._state = None
         return
 
     def setat(self, col: int, turn: str) -> None:
@@ -62,15 +200,54 @@ class World:
 
         :param turn: The character to set.
         """
-        row = 0
-        for r in reversed(range(7)):
-            c = self.getat(col, r)
-            if c != " ":
-                assert r < 6, "Cannot place character at position {}".format(col)
-                row = r + 1
-                break
-
-        self.setat_raw(col, row, turn)
+        col = int(col)
+        row = self.heights[col]
+        assert row < HEIGHT, "Cannot place character at position {}".format(col)
+
+        index = col * COL_STRIDE + row
+        bit = 1 << index
+        if turn == "X":
+            self.x_bits |= bit
+            bits = self.x_bits
+            winning_state = 1
+        elif turn == "O":
+            self.o_bits |= bit
+            bits = self.o_bits
+            winning_state = 2
+        else:
+            assert False, "Invalid turn character '{}'".format(turn)
+        self.heights[col] = row + 1
+        self.num_pieces += 1
+        self.last_move = (col, row)
+
+        # Only the lines through the piece just placed can have changed.
+        if self._state == 0:
+            for mask in WINDOWS[index]:
+                if bits & mask == mask:
+                    self._state = winning_state
+                    break
+            else:
+                if self.num_pieces == WIDTH * HEIGHT:
+                    self._state = 3
+        return
+
+    def unsetat(self, col: int) -> None:
+        """Remove the top piece from the specified column. This is used to undo setat()."""
+        col = int(col)
+        row = self.heights[col] - 1
+        assert row >= 0, "Cannot remove piece from empty column {}".format(col)
+
+        bit = 1 << (col * COL_STRIDE + row)
+        self.x_bits &= ~bit
+        self.o_bits &= ~bit
+        self.heights[col] = row
+        self.num_pieces -= 1
+
+        # Removing a piece cannot create a win, so an unfinished or drawn world
+        # is now unfinished. If the world had been won, the piece removed may
+        # not have been the winning one, so the next state check does a full scan.
+        self.last_move = None
+        self._state = 0 if self._state in (0, 3) else None
         return
 
     def show(self, indent: int = 0) -> None:
@@ -79,10 +256,11 @@ class World:
         if indent > 0:
             prefix += " " * indent
 
-        for r in reversed(range(7)):
-            if r < 6:
+        data = self.data
+        for r in reversed(range(HEIGHT)):
+            if r < HEIGHT - 1:
                 print(prefix + "|" + "-" * 27 + "|")
-            print(prefix + "| " + " | ".join(list(self.data[int(r)])) + " |")
+            print(prefix + "| " + " | ".join(list(data[int(r)])) + " |")
 
         print(prefix + "\\" + "-" * 27 + "/")
         print("")
@@ -98,51 +276,20 @@ class World:
             2 = O win.
             3 = draw.
         """
-        if " " not in self.data[6]:
-            return 3
+        if self._state is None:
+            self._state = self.scan_game_state()
+        return self._state
 
-        # For every item we encounter, see if it is part of a win in any direction.
-        d = self.data
-        for row in range(7):
-            for col in range(7):
-                c = d[row][col]
-                if c == " ":
-                    continue
+    def scan_game_state(self) -> int:
+        """Get current game state by scanning the whole world."""
+        if has_four(self.x_bits):
+            return 1
 
-                # Start search. Note that we only need to search to the right, up, and both upward diagonals.
-                if (
-                    col < 4
-                    and d[row][col + 1] == c
-                    and d[row][col + 2] == c
-                    and d[row][col + 3] == c
-                ):
-                    return 1 if c == "X" else 2
-
-                # Up
-                if row > 3:
-                    # Can't have 4-in-a-row if the bottom piece is > row 3.
-                    continue
+        if has_four(self.o_bits):
+            return 2
 
-                if d[row + 1][col] == c and d[row + 2][col] == c and d[row + 3][col] == c:
-                    return 1 if c == "X" else 2
-
-                # Diagonal left and up.
-                if (
-                    col > 2
-                    and d[row + 1][col - 1] == c
-                    and d[row + 2][col - 2] == c
-                    and d[row + 3][col - 3] == c
-                ):
-                    return 1 if c == "X" else 2
-
-                # Diagonal right and up.
-                if (
-                    col < 4
-                    and d[row + 1][col + 1] == c
-                    and d[row + 2][col + 2] == c
-                    and d[row + 3][col + 3] == c
-                ):
-                    return 1 if c == "x" else 2
+        if (self.x_bits | self.o_bits) & TOP_MASK == TOP_MASK:
+            return 3
         return 0
 
     def is_ended(self) -> bool:
@@ -166,4 +313,4 @@ class World:
 
         :returns: List of possible moves.
         """
-        return [x for x in range(7) if self.data[6][x] == " "]
+        return [x for x in range(WIDTH) if self.heights[x] < HEIGHT]
@@ -1,20 +1,120 @@
 """
 The Board class provides a representation of a naughts and crosses board.
 
-It consists of 9 characters,
-3 lots of 3, reading left to right, top to bottom.
+Internally the board is stored as two 9-bit integers (bitboards), one for X
+and one for O. Bit n is set if the player occupies position n:
+
+    0 | 1 | 2
+    -----------
+    3 | 4 | 5
+    -----------
+    6 | 7 | 8
+
+The string form is still available via the 'data' property, and is used for
+serialisation. It consists of 9 characters, 3 lots of 3, reading left to
+right, top to bottom.
 - = blank space. X and O are represented by exactly those letters (uppercase).
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
+
+
+SEQUENCES = ["012", "345", "678", "036", "147", "258", "048", "246"]
+
+# Bitmask for every possible winning line.
+WIN_MASKS = tuple(sum(1 << int(c) for c in seq) for seq in SEQUENCES)
+
+# Bitmask with all 9 positions set.
+FULL_MASK = 0x1FF
+
+# Lookup table: IS_WIN[bits] is True if 'bits' contains a winning line.
+IS_WIN = tuple(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(512))
+
+# Lookup table: MOVES[occupied_bits] is the tuple of empty positions.
+MOVES = tuple(tuple(x for x in range(9) if not bits & (1 << x)) for bits in range(512))
+
+# Transform map for a single 90 degree clockwise rotation.
+# New position 'index' takes the contents of old position ROTATE_MAP[index].
+ROTATE_MAP = [6, 3, 0, 7, 4, 1, 8, 5, 2]
+
+# Transform map for a left-right mirror, as per ROTATE_MAP.
+MIRROR_MAP = [2, 1, 0, 5, 4, 3, 8, 7, 6]
+
+
+def _transform_bits(bits: int, transform_map: List[int]) -> int:
+    """Apply the specified transform map to a bitboard."""
+    transformed = 0
+    for index, pos in enumerate(transform_map):
+        if bits & (1 << pos):
+            transformed |= 1 << index
+    return transformed
+
+
+# Lookup table: ROTATED[bits] is 'bits' rotated 90 degrees clockwise.
+ROTATED = tuple(_transform_bits(bits, ROTATE_MAP) for bits in range(512))
+
+# Lookup table: MIRRORED[bits] is 'bits' mirrored left to right.
+MIRRORED = tuple(_transform_bits(bits, MIRROR_MAP) for bits in range(512))
+
+
+def _get_symmetries() -> List[Tuple[int, ...]]:
+    """Get a lookup table for each of the 8 symmetries of the board."""
+    symmetries = []
+    table = tuple(range(512))
+    for _ in range(4):
+        symmetries.append(table)
+        symmetries.append(tuple(MIRRORED[bits] for bits in table))
+        table = tuple(ROTATED[bits] for bits in table)
+    return symmetries
+
+
+# Lookup tables for every rotation and reflection of the board, starting
+# with the identity. SYMMETRIES[n][bits] is 'bits' transformed.
+SYMMETRIES = _get_symmetries()
+
+# Lookup table: BASE3[bits] is the sum of 3^n for every position n set in 'bits'.
+# The base-3 key for a board is BASE3[x_bits] + 2 * BASE3[o_bits].
+BASE3 = tuple(sum(3**pos for pos in range(9) if bits & (1 << pos)) for bits in range(512))
 
 
 class Board:
     """Representation of a naughts and crosses board."""
 
+    __slots__ = ("x_bits", "o_bits")
+
     def __init__(self) -> None:
         """Create a new Board object."""
-        self.data = "---------"
+        self.x_bits = 0
+        self.o_bits = 0
+        return
+
+    @property
+    def data(self) -> str:
+        """Get the board as a 9-character string."""
+        chars = []
+        for pos in range(9):
+            bit = 1 << pos
+            if self.x_bits & bit:
+                chars.append("X")
+            elif self.o_bits & bit:
+                chars.append("O")
+            else:
+                chars.append("-")
+        return "".join(chars)
+
+    @data.setter
+    def data(self, value: str) -> None:
+        """Set the board from a 9-character string."""
+        assert len(value) == 9, "Invalid board length. Data is '{}'".format(value)
+        x_bits = 0
+        o_bits = 0
+        for pos, c in enumerate(value):
+            if c == "X":
+                x_bits |= 1 << pos
+            elif c == "O":
+                o_bits |= 1 << pos
+        self.x_bits = x_bits
+        self.o_bits = o_bits
         return
 
     def to_dict(self) -> Dict[str, Any]:
@@ -26,10 +126,15 @@ class Board:
         self.data = d.get("data", "---------")
         return
 
+    def get_key(self) -> int:
+        """Get the base-3 key for this board. See games.naughts.statetable."""
+        return BASE3[self.x_bits] + 2 * BASE3[self.o_bits]
+
     def copy(self) -> "Board":
         """Clone this Board instance."""
         b = Board()
-        b.data = self.data
+        b.x_bits = self.x_bits
+        b.o_bits = self.o_bits
         return b
 
     def getat(self, pos: int) -> str:
@@ -46,10 +151,12 @@ class Board:
 
         :returns: Character at the specified position. One of 'X', 'O', or ' '.
         """
-        c = self.data[int(pos)]
-        if c == "-":
-            c = " "
-        return c
+        bit = 1 << int(pos)
+        if self.x_bits & bit:
+            return "X"
+        if self.o_bits & bit:
+            return "O"
+        return " "
 
     def setat(self, pos: int, turn: str) -> None:
         """Set the character at the specified position.
@@ -64,20 +171,24 @@ class Board:
 
         :param turn: The character to set.
         """
-        c = self.getat(pos)
-        assert c == " ", ("Tried setting '{}' at pos {} but it already " "contained '{}'").format(
-            turn, pos, c
-        )
-
-        # Can't modify strings in place, so use a list instead.
-        newdata = list(self.data)
-        newdata[pos] = turn
-        newdata_str = "".join(newdata)
-
-        assert len(newdata_str) == 9, "Invalid board length after set. " "New data is '{}'".format(
-            newdata_str
-        )
-        self.data = newdata_str
+        bit = 1 << int(pos)
+        assert not (self.x_bits | self.o_bits) & bit, (
+            "Tried setting '{}' at pos {} but it already " "contained '{}'"
+        ).format(turn, pos, self.getat(pos))
+
+        if turn == "X":
+            self.x_bits |= bit
+        elif turn == "O":
+            self.o_bits |= bit
+        else:
+            assert False, "Invalid turn character '{}'".format(turn)
+        return
+
+    def clearat(self, pos: int) -> None:
+        """Clear the specified position. This is used to undo setat()."""
+        bit = 1 << int(pos)
+        self.x_bits &= ~bit
+        self.o_bits &= ~bit
         return
 
     def show(self, indent: int = 0) -> None:
@@ -111,25 +222,13 @@ class Board:
             2 = O win.
             3 = draw.
         """
-        sequences = ["012", "345", "678", "036", "147", "258", "048", "246"]
+        if IS_WIN[self.x_bits]:
+            return 1
 
-        for seq in sequences:
-            val = ""
-            for c in seq:
-                val += self.getat(int(c))
+        if IS_WIN[self.o_bits]:
+            return 2
 
-            if val == "XXX":
-                return 1
-            elif val == "OOO":
-                return 2
-
-        is_draw = True
-        for pos in range(9):
-            val = self.getat(pos)
-            if val != "X" and val != "O":
-                is_draw = False
-
-        if is_draw:
+        if self.x_bits | self.o_bits == FULL_MASK:
             return 3
         return 0
 
@@ -162,10 +261,7 @@ class Board:
         :param pos_str: List of positions.
         :returns: String containing the characters at the specified positions.
         """
-        contents = ""
-        for n in range(len(pos_str)):
-            contents += self.getat(int(pos_str[n]))
-        return contents
+        return "".join([self.getat(int(c)) for c in pos_str])
 
     def get_rotated_board(self, rotations: int) -> "Board":
         """
@@ -181,28 +277,16 @@ class Board:
         rotations = int(rotations) % 4
 
         board_copy = self.copy()
-        transform_map = [6, 3, 0, 7, 4, 1, 8, 5, 2]
-
-        # Minor optimisation. Don't do anything if we don't have to.
-        if rotations == 0:
-            return board_copy
-
         for _ in range(rotations):
-            orig_data = board_copy.data
-
-            new_data = list(orig_data)
-            for index, pos in enumerate(transform_map):
-                new_data[index] = orig_data[pos]
-
-            board_copy.data = "".join(new_data)
+            board_copy.x_bits = ROTATED[board_copy.x_bits]
+            board_copy.o_bits = ROTATED[board_copy.o_bits]
         return board_copy
 
     def get_first_empty_space(self, positions: str) -> int:
         """Get the first empty position from the list of positions."""
-        pos_list = list(positions)
-
-        for pos in pos_list:
-            if self.getat(int(pos)) == " ":
+        occupied = self.x_bits | self.o_bits
+        for pos in positions:
+            if not occupied & (1 << int(pos)):
                 return int(pos)
         return -1
 
@@ -212,4 +296,4 @@ class Board:
 
         :returns: List of possible moves.
         """
-        return [x for x in range(9) if self.getat(x) == " "]
+        return list(MOVES[self.x_bits | self.o_bits])
@@ -16,6 +16,7 @@ class GenBot2(NaughtsBot):
         """Create new GenBot2."""
         super().__init__()
         self.genetic = True
+        self.deterministic = True
         self.nodes = []
         self.output_nodes = []
         return
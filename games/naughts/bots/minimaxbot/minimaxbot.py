@@ -14,6 +14,7 @@ import random
 
 from games.naughts.board import Board
 from games.naughts.bots.naughtsbot import NaughtsBot
+from games.naughts.statetable import get_entry
 
 
 class MinimaxBot(NaughtsBot):
@@ -24,20 +25,17 @@ class MinimaxBot(NaughtsBot):
         moves = current_board.get_possible_moves()
 
         # First, win the game if we can.
-        straight_sequences = ["012", "345", "678", "036", "147", "258", "048", "246"]
-
-        for seq in straight_sequences:
-            (ours, theirs, blanks) = self.get_sequence_info(current_board, seq)
-            if len(ours) == 2 and len(blanks) == 1:
-                # Move into the blank for the win.
-                return int(blanks[0])
+        entry = get_entry(current_board)
+        winning_moves = entry.get_winning_moves(self.identity)
+        if winning_moves:
+            # Move into the blank for the win.
+            return winning_moves[0]
 
         # Second, if we can't win, make sure the opponent can't win either.
-        for seq in straight_sequences:
-            (ours, theirs, blanks) = self.get_sequence_info(current_board, seq)
-            if len(theirs) == 2 and len(blanks) == 1:
-                # Move into the blank to block the win.
-                return int(blanks[0])
+        blocking_moves = entry.get_winning_moves(self.other_identity)
+        if blocking_moves:
+            # Move into the blank to block the win.
+            return blocking_moves[0]
 
         # If this is the first move...
         (ours, theirs, blanks) = self.get_sequence_info(current_board, "012345678")
@@ -58,10 +56,12 @@ class MinimaxBot(NaughtsBot):
         # Get the (first) move with the best score...
         best_score = None
         choices = []
+        # Search a single copy of the board, making and unmaking moves in place.
+        temp_board = current_board.copy()
         for move in moves:
-            temp_board = current_board.copy()
             temp_board.setat(int(move), self.identity)
             score = self.alphabeta(temp_board, self.get_opponent(), -999, 999)
+            temp_board.clearat(int(move))
 
             if best_score is None or score > best_score:
                 best_score = score
@@ -87,7 +87,8 @@ class MinimaxBot(NaughtsBot):
     def alphabeta(self, node_board, turn, alpha, beta, depth=0):
         """Alpha-beta algorithm. This is a recursive method.
 
-        :param node_board: The board for this node.
+        :param node_board: The board for this node. Moves are made and
+            unmade in place, so the board is unchanged on return.
         :param turn: The identity character for this turn.
         :param alpha: The min score.
         :param beta: The max score.
@@ -95,18 +96,19 @@ class MinimaxBot(NaughtsBot):
             NOTE: depth is provided only for debugging purposes.
         :returns: The score of the specified move.
         """
-        moves = node_board.get_possible_moves()
-        if not moves or node_board.is_ended():
+        entry = get_entry(node_board)
+        moves = entry.moves
+        if not moves or entry.state != 0:
             return self.get_board_score(node_board)
 
         if turn == self.identity:
             v = -999
             for move in moves:
-                test_board = node_board.copy()
-                test_board.setat(int(move), turn)
+                node_board.setat(int(move), turn)
                 v = max(
-                    v, self.alphabeta(test_board, self.get_opponent(turn), alpha, beta, depth + 1)
+                    v, self.alphabeta(node_board, self.get_opponent(turn), alpha, beta, depth + 1)
                 )
+                node_board.clearat(int(move))
                 alpha = max(alpha, v)
                 if beta <= alpha:
                     break
@@ -115,9 +117,9 @@ class MinimaxBot(NaughtsBot):
 
         v = 999
         for move in moves:
-            test_board = node_board.copy()
-            test_board.setat(int(move), turn)
-            v = min(v, self.alphabeta(test_board, self.get_opponent(turn), alpha, beta, depth + 1))
+            node_board.setat(int(move), turn)
+            v = min(v, self.alphabeta(node_board, self.get_opponent(turn), alpha, beta, depth + 1))
+            node_board.clearat(int(move))
             beta = min(beta, v)
             if beta <= alpha:
                 break
@@ -8,30 +8,34 @@ Might be useful for training AI bots.
 
 from games.naughts.board import Board
 from games.naughts.bots.naughtsbot import NaughtsBot
+from games.naughts.statetable import get_entry
 
 
 class SimpleBot(NaughtsBot):
     """Simple bot that just follows a pre-defined list of moves."""
 
+    def __init__(self) -> None:
+        """Create new SimpleBot object."""
+        super().__init__()
+        self.deterministic = True
+        return
+
     def do_turn(self, current_board: Board) -> int:
         """Do one turn for the SimpleBot."""
         moves = current_board.get_possible_moves()
 
         # First, win the game if we can.
-        straight_sequences = ["012", "345", "678", "036", "147", "258", "048", "246"]
-
-        for seq in straight_sequences:
-            (ours, theirs, blanks) = self.get_sequence_info(current_board, seq)
-            if len(ours) == 2 and len(blanks) == 1:
-                # Move into the blank for the win.
-                return int(blanks[0])
+        entry = get_entry(current_board)
+        winning_moves = entry.get_winning_moves(self.identity)
+        if winning_moves:
+            # Move into the blank for the win.
+            return winning_moves[0]
 
         # Second, if we can't win, make sure the opponent can't win either.
-        for seq in straight_sequences:
-            (ours, theirs, blanks) = self.get_sequence_info(current_board, seq)
-            if len(theirs) == 2 and len(blanks) == 1:
-                # Move into the blank to block the win.
-                return int(blanks[0])
+        blocking_moves = entry.get_winning_moves(self.other_identity)
+        if blocking_moves:
+            # Move into the blank to block the win.
+            return blocking_moves[0]
 
         # If this is the first move...
         (ours, theirs, blanks) = self.get_sequence_info(current_board, "012345678")
@@ -1,9 +1,11 @@
 """Module for running a single game of naughts and crosses."""
 
 
-from typing import Any, Dict, List, Tuple
+from array import array
+from typing import Any, Dict, Sequence, Tuple
 
 from games.naughts.board import Board
+from games.naughts.statetable import get_bits, get_entry, get_key
 from lib.gamebase import GameBase
 from lib.gameresult import GameResult
 
@@ -14,6 +16,7 @@ class SingleGame(GameBase):
     identities = ("X", "O")
     input_count = 18
     output_count = 9
+    max_score = 7.0  # Best possible score: a win in 3 turns.
 
     def __init__(self) -> None:
         """Create a new SingleGame object."""
@@ -36,26 +39,18 @@ class SingleGame(GameBase):
         """Get the game state."""
         return {"board": self.game_board.to_dict()}
 
-    def get_inputs(self, identity: str) -> Tuple[List[float], List[float]]:
-        """Convert current game state into a list of player-specific inputs."""
-        inputs = []
-        for pos in range(9):
-            c = self.game_board.getat(pos)
-            if c == identity:
-                inputs.append(1.0)
-            else:
-                inputs.append(0.0)
+    def fill_inputs(self, identity: str, buffer: array) -> None:
+        """Write the full set of player-specific inputs into the buffer."""
+        buffer[:] = array("d", get_entry(self.game_board).get_inputs(identity))
+        return
 
-        for pos in range(9):
-            c = self.game_board.getat(pos)
-            if c == identity or c == " ":
-                inputs.append(0.0)
-            else:
-                inputs.append(1.0)
-        return inputs, self.game_board.get_possible_moves()
+    def get_inputs(self, identity: str) -> Tuple[Sequence[float], Sequence[float]]:
+        """Get the player-specific inputs and the available moves."""
+        # The state table's moves are a tuple, so bots cannot change them.
+        return self.get_input_view(identity), get_entry(self.game_board).moves
 
-    def update(self, identity: str, output: float) -> None:
-        """Assign closest valid move to this bot."""
+    def update(self, identity: str, output: float) -> int:
+        """Assign closest valid move to this bot, and return the move."""
         # TODO: The next step is to abort games if a bot returned an invalid move.
         #       This will force bots to learn the game rules first.
         moves = self.game_board.get_possible_moves()
@@ -74,17 +69,34 @@ class SingleGame(GameBase):
 
         assert target_move is not None, "BUG: update() failed to select target move!"
         self.game_board.setat(target_move, identity)
+
+        # Update the input buffers in place. Inputs 0-8 are our positions,
+        # and inputs 9-17 are the opponent's positions.
+        for other_identity in self.identities:
+            if other_identity == identity:
+                self.set_input(other_identity, target_move, 1.0)
+            else:
+                self.set_input(other_identity, target_move + 9, 1.0)
+        return target_move
+
+    def undo_update(self, identity: str, move: int) -> None:
+        """Revert the move returned by update()."""
+        self.game_board.clearat(move)
+        for other_identity in self.identities:
+            if other_identity == identity:
+                self.set_input(other_identity, move, 0.0)
+            else:
+                self.set_input(other_identity, move + 9, 0.0)
         return
 
     def is_ended(self) -> bool:
         """Return True if the game has ended, otherwise False."""
         assert self.game_board, "No game board!"
-        return self.game_board.is_ended()
+        return get_entry(self.game_board).state != 0
 
     def get_result(self) -> GameResult:
         """Process and return game result."""
-        for bot in self.bots:
-            bot.show_result(self.game_board)
+        self.show_result()
 
         result = GameResult()
 
@@ -111,6 +123,39 @@ class SingleGame(GameBase):
 
         return result
 
+    def get_position_key(self) -> int:
+        """
+        Get a key identifying the current position: the base-3 key of the board.
+
+        The side to move is not needed, since X always moves first.
+        """
+        return get_key(self.game_board.x_bits, self.game_board.o_bits)
+
+    def set_position_key(self, key: int) -> None:
+        """Restore the position from a key returned by get_position_key() or get_canonical_key()."""
+        board = Board()
+        board.x_bits, board.o_bits = get_bits(key)
+        self.game_board = board
+        self.num_turns = {"X": bin(board.x_bits).count("1"), "O": bin(board.o_bits).count("1")}
+        self.current_bot_index = 0 if self.num_turns["X"] == self.num_turns["O"] else 1
+        self.move_stack = []
+        self.refresh_inputs()
+        return
+
+    def get_canonical_key(self) -> int:
+        """Get the smallest position key over all 8 rotations and reflections of the board."""
+        return get_entry(self.game_board).canonical_key
+
+    def get_outcome(self) -> int:
+        """Get the outcome of a finished game: 1 for an X win, 2 for an O win, or 3 for a draw."""
+        return self.game_board.get_game_state()
+
+    def show_result(self) -> None:
+        """Allow every bot to see the final board."""
+        for bot in self.bots:
+            bot.show_result(self.game_board)
+        return
+
     def calculate_score(self, num_turns: int, outcome: int) -> float:
         """
         Calculate the 'score' for this game.
@@ -0,0 +1,170 @@
+"""
+Precomputed table of every naughts and crosses board encoding.
+
+Each board is identified by a base-3 key, where the digit for position n
+(i.e. the 3^n column) is 0 for a blank space, 1 for X and 2 for O. There
+are 3^9 = 19,683 possible keys. Most of them can never occur in a real
+game, but indexing every key keeps each lookup to a single list access.
+
+The table is built once, when this module is first imported. Only the
+5,478 positions reachable in a real game are built up front. Entries for
+any other key are built the first time they are requested.
+"""
+
+from typing import List, Optional, Tuple
+
+from games.naughts.board import BASE3, IS_WIN, MOVES, SYMMETRIES, WIN_MASKS, Board
+
+
+NUM_KEYS = 3**9
+
+# Lookup table: INPUT_HALVES[bits] is 9 floats, 1.0 for each occupied position.
+INPUT_HALVES = tuple(
+    tuple(1.0 if bits & (1 << pos) else 0.0 for pos in range(9)) for bits in range(512)
+)
+
+
+def get_key(x_bits: int, o_bits: int) -> int:
+    """Get the base-3 key for the specified X and O bitboards."""
+    return BASE3[x_bits] + 2 * BASE3[o_bits]
+
+
+def get_bits(key: int) -> Tuple[int, int]:
+    """Get the X and O bitboards for the specified base-3 key."""
+    x_bits = 0
+    o_bits = 0
+    for pos in range(9):
+        key, digit = divmod(key, 3)
+        if digit == 1:
+            x_bits |= 1 << pos
+        elif digit == 2:
+            o_bits |= 1 << pos
+    return x_bits, o_bits
+
+
+def get_symmetries(x_bits: int, o_bits: int) -> List[Tuple[int, int]]:
+    """Get all 8 symmetries of the specified bitboards, as per board.SYMMETRIES."""
+    return [(table[x_bits], table[o_bits]) for table in SYMMETRIES]
+
+
+def get_winning_moves(bits: int, other_bits: int) -> Tuple[int, ...]:
+    """
+    Get the positions that would complete a line for the player with 'bits'.
+
+    Positions are returned in the same order as the winning sequences are
+    listed in board.SEQUENCES, without duplicates.
+    """
+    moves = []  # type: List[int]
+    for mask in WIN_MASKS:
+        if other_bits & mask:
+            continue
+
+        ours = bits & mask
+        if ours == mask or bin(ours).count("1") != 2:
+            continue
+
+        move = (mask & ~ours).bit_length() - 1
+        if move not in moves:
+            moves.append(move)
+    return tuple(moves)
+
+
+class StateEntry:
+    """Precomputed details for a single board encoding."""
+
+    __slots__ = (
+        "state",
+        "winner",
+        "moves",
+        "canonical_key",
+        "inputs_x",
+        "inputs_o",
+        "winning_moves_x",
+        "winning_moves_o",
+    )
+
+    def __init__(self, x_bits: int, o_bits: int) -> None:
+        """Create a new StateEntry for the specified X and O bitboards."""
+        # Game state, as returned by Board.get_game_state().
+        if IS_WIN[x_bits]:
+            self.state = 1
+            self.winner = "X"
+        elif IS_WIN[o_bits]:
+            self.state = 2
+            self.winner = "O"
+        elif x_bits | o_bits == 0x1FF:
+            self.state = 3
+            self.winner = ""
+        else:
+            self.state = 0
+            self.winner = ""
+
+        self.moves = MOVES[x_bits | o_bits]
+        self.canonical_key = min(get_key(x, o) for x, o in get_symmetries(x_bits, o_bits))
+
+        # Inputs as returned by SingleGame.get_inputs(), for each identity.
+        self.inputs_x = INPUT_HALVES[x_bits] + INPUT_HALVES[o_bits]
+        self.inputs_o = INPUT_HALVES[o_bits] + INPUT_HALVES[x_bits]
+
+        # Moves that would immediately win the game, for each identity.
+        self.winning_moves_x = get_winning_moves(x_bits, o_bits)
+        self.winning_moves_o = get_winning_moves(o_bits, x_bits)
+        return
+
+    def get_inputs(self, identity: str) -> Tuple[float, ...]:
+        """Get the inputs for the specified identity."""
+        if identity == "X":
+            return self.inputs_x
+        return self.inputs_o
+
+    def get_winning_moves(self, identity: str) -> Tuple[int, ...]:
+        """Get the moves that would immediately win the game for the specified identity."""
+        if identity == "X":
+            return self.winning_moves_x
+        return self.winning_moves_o
+
+
+# STATE_TABLE[key] is the StateEntry for that key. Every position reachable
+# in a real game is populated below. Any other key is filled in on first use.
+STATE_TABLE = [None] * NUM_KEYS  # type: List[Optional[StateEntry]]
+
+
+def _populate_table() -> None:
+    """Add an entry to the state table for every reachable position."""
+    stack = [(0, 0)]
+    while stack:
+        x_bits, o_bits = stack.pop()
+        key = get_key(x_bits, o_bits)
+        if STATE_TABLE[key] is not None:
+            continue
+
+        entry = StateEntry(x_bits, o_bits)
+        STATE_TABLE[key] = entry
+        if entry.state != 0:
+            continue
+
+        x_turn = bin(x_bits).count("1") == bin(o_bits).count("1")
+        for move in entry.moves:
+            if x_turn:
+                stack.append((x_bits | (1 << move), o_bits))
+            else:
+                stack.append((x_bits, o_bits | (1 << move)))
+    return
+
+
+_populate_table()
+
+
+def get_entry_for_bits(x_bits: int, o_bits: int) -> StateEntry:
+    """Get the StateEntry for the specified X and O bitboards."""
+    key = BASE3[x_bits] + 2 * BASE3[o_bits]
+    entry = STATE_TABLE[key]
+    if entry is None:
+        entry = StateEntry(x_bits, o_bits)
+        STATE_TABLE[key] = entry
+    return entry
+
+
+def get_entry(board: Board) -> StateEntry:
+    """Get the StateEntry for the specified board."""
+    return get_entry_for_bits(board.x_bits, board.o_bits)
@@ -0,0 +1,60 @@
+"""
+Module for running many games of naughts and crosses in lockstep.
+
+Boards are stored as a single (num_games, 9) int8 array, using the same
+positions as games.naughts.board. Each cell is 0 for a blank space, 1 for X
+or 2 for O.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from games.naughts.board import SEQUENCES, Board
+from lib.batch import DRAW
+from lib.vectorgamebase import VectorGameBase
+
+# Positions of every winning line, as a (8, 3) array.
+LINES = np.array([[int(c) for c in seq] for seq in SEQUENCES], dtype=np.intp)
+
+
+class VectorGame(VectorGameBase):
+    """Run many games of naughts and crosses in lockstep."""
+
+    identities = ("X", "O")
+    input_count = 18
+    output_count = 9
+
+    def __init__(self, num_games: int, common_random: bool = False) -> None:
+        """Create a new VectorGame object."""
+        super().__init__(num_games, common_random)
+        self.boards = np.zeros((num_games, 9), dtype=np.int8)
+        return
+
+    def get_inputs(self, active: np.ndarray, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the inputs and legal moves for the specified games."""
+        boards = self.boards[active]
+        ours = boards == index + 1
+        theirs = (boards != 0) & ~ours
+        inputs = np.concatenate([ours, theirs], axis=1).astype(np.float64)
+        return inputs, boards == 0
+
+    def update(self, active: np.ndarray, index: int, moves: np.ndarray) -> None:
+        """Apply moves to the specified games, and update the outcomes."""
+        piece = index + 1
+        self.boards[active, moves] = piece
+
+        # Only the player who just moved can have won.
+        boards = self.boards[active]
+        won = (boards[:, LINES] == piece).all(axis=2).any(axis=1)
+        full = (boards != 0).all(axis=1)
+
+        self.outcomes[active[won]] = piece
+        self.outcomes[active[full & ~won]] = DRAW
+        return
+
+    def get_result_data(self, game_index: int) -> Board:
+        """Get the final board of the specified game."""
+        board = Board()
+        board.data = "".join("-XO"[x] for x in self.boards[game_index])
+        return board
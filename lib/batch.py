@@ -1,23 +1,42 @@
 """Run a batch of games."""
 
-from typing import Any, Deque, Dict, List
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Type, TYPE_CHECKING
 
-import collections
-import copy
+import math
 import random
 import time
 
+from lib.batchstats import BatchStats, ResultBuffer
 from lib.botfactory import BotFactory
 from lib.gamebase import GameBase
 from lib.gamecontext import GameContext
 from lib.gamefactory import GameFactory
 from lib.gameplayer import GamePlayer
 from lib.gameresult import GameResult
+from lib.progress import ProgressReporter
+
+if TYPE_CHECKING:
+    from lib.vectorgamebase import VectorGameBase
 
 P1_WINS = 1
 P2_WINS = 2
 DRAW = 3
 
+# Maximum number of games to run in lockstep, to limit memory use.
+VECTOR_CHUNK_SIZE = 10000
+
+# Number of games to run in lockstep between checks for stopping early.
+CHECK_CHUNK_SIZE = 100
+
+# Minimum number of games before the confidence interval is trusted.
+PRECISION_MIN_GAMES = 30
+
+# Default maximum number of positions to remember in a magic batch.
+MAGIC_MAX_POSITIONS = 100000
+
+# Default number of moves to play before a magic batch is split across processes.
+MAGIC_SPLIT_DEPTH = 3
+
 
 class Batch(GameContext):
     """A Batch will run a batch of single games."""
@@ -40,52 +59,193 @@ class Batch(GameContext):
         self.batch_size = self.batch_config.get("batch_size", 1)
         self.stop_on_loss = self.batch_config.get("stop_on_loss", False)
         self.magic = self.batch_config.get("magic", False)
+        self.vector = self.batch_config.get("vector", True)
+        self.seed = self.batch_config.get("seed")
+        self.magic_memory = self.batch_config.get("magic_memory") or MAGIC_MAX_POSITIONS
+        self.magic_split_depth = self.batch_config.get("magic_split_depth") or MAGIC_SPLIT_DEPTH
+
+        # If common_random is set (and a seed is given), each game is seeded
+        # from its index in the batch. Any two batches with the same seed then
+        # present the same random draws to each bot, game for game.
+        self.common_random = self.batch_config.get("common_random", False)
+
+        # Set with set_score_threshold(), to stop the batch as soon as the
+        # specified bot can no longer beat the threshold.
+        self.score_threshold = None  # type: Optional[float]
+        self.score_index = 0
+        self.max_score = None  # type: Optional[float]
+        self.rejected = False
+
+        # If precision is set, the batch stops as soon as the confidence
+        # interval for every bot's average score is within +/- precision.
+        # batch_size is then the maximum number of games.
+        self.precision = self.batch_config.get("precision")  # type: Optional[float]
 
         self.label = ""
         # info is used by genetic.batchworker.
         self.info = {}  # type: Dict[str, Any]
 
         self.overall_results = {P1_WINS: 0, P2_WINS: 0, DRAW: 0}
-        self.num_games_played = 0
-        self.total_score = {}  # type: Dict[str, float]
-        self.wins = {}  # type: Dict[str, float]
-        self.num_draws = 0
         self.identities = []  # type: List[str]
+        self.num_splits = 0
+
+        # Progress of a magic batch. Each entry in magic_branches holds
+        # [branches done, number of branches] for one level of the search.
+        self.num_leaves = 0
+        self.magic_branches = []  # type: List[List[int]]
+        self.progress = ProgressReporter()
+
+        # Running totals for all games played. Created by start_batch().
+        self.stats = None  # type: Optional[BatchStats]
         return
 
+    @property
+    def num_games_played(self) -> int:
+        """Get the number of games played so far."""
+        return self.stats.num_games if self.stats else 0
+
+    @property
+    def num_draws(self) -> int:
+        """Get the number of drawn games so far."""
+        return self.stats.get_draws() if self.stats else 0
+
+    @property
+    def wins(self) -> Dict[str, int]:
+        """Get the number of games won by each identity so far."""
+        if not self.stats:
+            return {}
+        return {identity: self.stats.get_wins(identity) for identity in self.identities}
+
+    @property
+    def total_score(self) -> Dict[str, float]:
+        """Get the total score for each identity so far."""
+        if not self.stats:
+            return {}
+        return {identity: self.stats.get_total_score(identity) for identity in self.identities}
+
     def run_batch(self) -> GameResult:
         """Run this batch and return the average scores."""
         self.start_batch()
-        if self.magic:
-            self.run_magic_batch()
-        else:
-            self.run_normal_batch()
+        self.run_games()
         return self.process_batch_result()
 
+    def run_games(self) -> None:
+        """Run all games in this batch, adding to the totals."""
+        # Bots draw from the global random module, so a seeded batch has to
+        # reseed it. Put it back afterwards, so that the caller's own random
+        # draws (e.g. genetic mutations) don't depend on the batch seed.
+        random_state = random.getstate() if self.seed is not None else None
+        try:
+            if self.seed is not None and not self.common_random:
+                random.seed(self.seed)
+
+            vector_batch = None
+            if not self.magic and self.vector:
+                vector_batch = self.get_vector_batch()
+
+            if self.magic:
+                self.run_magic_batch()
+            elif vector_batch:
+                self.run_vector_batch(*vector_batch)
+            else:
+                self.run_normal_batch()
+        finally:
+            if random_state is not None:
+                random.setstate(random_state)
+        return
+
     def start_batch(self) -> None:
         """Start this batch."""
         # Run a single batch.
         class_ = GameFactory(self).get_game_class(self.game)
         self.identities = list(class_.identities)
-        for identity in self.identities:
-            self.total_score[identity] = 0
-            self.wins[identity] = 0
+        self.max_score = class_.max_score
+        self.rejected = False
+
+        score_game = GameFactory(self).get_game_obj(self.game)
+        self.stats = BatchStats(self.identities, score_game.calculate_score)
+
+        # Totals from games already played (e.g. in an earlier round of a
+        # genetic race). The batch carries on from there, up to batch_size games.
+        totals = self.batch_config.get("totals")
+        if totals:
+            self.merge_totals(totals)
+        return
+
+    def set_score_threshold(self, index: int, score_threshold: float) -> None:
+        """
+        Stop the batch early if the specified bot cannot beat score_threshold.
+
+        After every chunk of games, the bot's best possible average is
+        calculated, assuming it gets the game's max_score in every remaining
+        game. If that cannot exceed score_threshold, the batch is stopped and
+        marked as rejected. The average score is then
+        over the games played, which is never above score_threshold.
 
-        self.num_games_played = 0
-        self.num_draws = 0
+        This has no effect on magic batches, or games without a max_score.
+
+        :param index: Index of the bot whose score is checked.
+        :param score_threshold: The score to beat.
+        """
+        self.score_index = index
+        self.score_threshold = score_threshold
         return
 
-    def process_game_result(self, result: GameResult) -> None:
-        """Process the result of a single game."""
-        self.num_games_played += 1
+    def check_rejected(self) -> bool:
+        """Check whether the batch can be stopped early, as per set_score_threshold()."""
+        if self.score_threshold is None or self.max_score is None:
+            return False
+
+        assert self.stats, "BUG: Batch not started"
+        identity = self.identities[self.score_index]
+        num_remaining = self.batch_size - self.num_games_played
+        best_total = self.stats.get_total_score(identity) + num_remaining * self.max_score
+        if best_total / self.batch_size <= self.score_threshold:
+            self.rejected = True
+        return self.rejected
+
+    def check_precision(self) -> bool:
+        """Check whether the batch can be stopped early, as per precision."""
+        if self.precision is None or self.num_games_played < PRECISION_MIN_GAMES:
+            return False
+
+        assert self.stats, "BUG: Batch not started"
+        return all(
+            self.stats.get_confidence_interval(identity) <= self.precision
+            for identity in self.identities
+        )
 
+    def get_games_needed(self) -> int:
+        """Estimate the total number of games needed to reach the target precision."""
+        assert self.stats, "BUG: Batch not started"
+        games_needed = 0
         for identity in self.identities:
-            self.total_score[identity] += result.get_score(identity)
+            half_width = self.stats.get_confidence_interval(identity)
+            if math.isinf(half_width):
+                return PRECISION_MIN_GAMES
 
-        if result.is_tie():
-            self.num_draws += 1
-        else:
-            self.wins[result.get_winner()] += 1
+            # The half-width shrinks with the square root of the number of games.
+            ratio = half_width / self.precision
+            games_needed = max(games_needed, math.ceil(self.num_games_played * ratio * ratio))
+        return games_needed
+
+    def seed_game(self, index: int) -> None:
+        """Seed the random number generator for the specified game, if common_random is set."""
+        if self.seed is not None and self.common_random:
+            random.seed((self.seed << 32) + index)
+        return
+
+    def get_totals(self) -> Dict[str, Any]:
+        """Get the totals for this batch, for merging with merge_totals()."""
+        assert self.stats, "BUG: Batch not started"
+        return self.stats.to_dict()
+
+    def merge_totals(self, totals: Dict[str, Any]) -> None:
+        """Add the totals from another batch (e.g. one shard of this batch)."""
+        assert self.stats, "BUG: Batch not started"
+        other = BatchStats(self.identities, self.stats.calculate_score)
+        other.from_dict(totals)
+        self.stats.merge(other)
         return
 
     def process_batch_result(self) -> GameResult:
@@ -97,6 +257,12 @@ class Batch(GameContext):
         # Print overall results.
         self.log.info("\nRESULTS:")
         self.log.info("Games Played: {}".format(self.num_games_played))
+        if self.rejected:
+            self.log.info(
+                "Rejected after {} of {} games: cannot beat {}".format(
+                    self.num_games_played, self.batch_size, self.score_threshold
+                )
+            )
         self.log.info("")
 
         for i, bot in enumerate(self.bots):
@@ -106,55 +272,360 @@ class Batch(GameContext):
         self.log.info("")
 
         # Get average scores.
-        assert self.num_games_played > 0, "BUG: No games played!"
+        assert self.stats and self.num_games_played > 0, "BUG: No games played!"
 
         batch_result = GameResult()
         batch_result.set_batch()
         self.log.info("\nAverage Scores:")
         for i, identity in enumerate(self.identities):
-            self.bots[i].score = float(self.total_score[identity] / self.num_games_played)
+            self.bots[i].score = self.stats.get_mean(identity)
             batch_result.set_score(identity, self.bots[i].score)
             self.log.info("{}: {}".format(self.bots[i].name, self.bots[i].score))
+
+        if self.precision is not None:
+            self.log.info("\n95% Confidence Intervals:")
+            for i, identity in enumerate(self.identities):
+                self.log.info(
+                    "{}: {} +/- {}".format(
+                        self.bots[i].name,
+                        self.bots[i].score,
+                        self.stats.get_confidence_interval(identity),
+                    )
+                )
         return batch_result
 
     def run_normal_batch(self) -> None:
         """Run normal batch of games."""
         self.log.info("\n********** Running Batch **********\n")
-        for _ in range(1, self.batch_size + 1):
-            game_obj = GameFactory(self).get_game_obj(self.game)
-            game_obj.set_initial_state()
-
-            bots = BotFactory(self, bot_config=self.bot_config).clone_bots(self.bots)
-            game_obj.start(bots)
-            result = game_obj.run()
-            self.process_game_result(result)
+        # Create the game and bots once, and reuse them for every game.
+        game_obj = GameFactory(self).get_game_obj(self.game)
+        bots = BotFactory(self, bot_config=self.bot_config).clone_bots(self.bots)
+        assert self.stats, "BUG: Batch not started"
+
+        # Results are kept in a ResultBuffer, and added to the totals after
+        # every chunk of games (when the batch may also be stopped early).
+        buffer = ResultBuffer(self.identities, VECTOR_CHUNK_SIZE)
+        num_played = self.num_games_played
+        while num_played < self.batch_size and not (
+            self.check_rejected() or self.check_precision()
+        ):
+            num_games = min(self.batch_size - num_played, self.get_chunk_size())
+            for index in range(num_played, num_played + num_games):
+                self.seed_game(index)
+                game_obj.set_initial_state()
+                for bot in bots:
+                    bot.reset_for_game()
+
+                game_obj.start(bots)
+                while not game_obj.is_ended():
+                    game_obj.do_turn()
+                game_obj.show_result()
+                buffer.add(game_obj.get_outcome(), game_obj.num_turns)
+
+            buffer.flush(self.stats)
+            num_played += num_games
         return
 
+    def get_vector_batch(self) -> Optional[Tuple[Type["VectorGameBase"], List[GamePlayer]]]:
+        """
+        Get the vectorised game class, and bots ready to play it.
+
+        :returns: Tuple of (class, bots), or None if the game or any of the
+            bots does not support vectorised games.
+        """
+        class_ = GameFactory(self).get_vector_game_class(self.game)
+        if not class_:
+            return None
+
+        bots = BotFactory(self, bot_config=self.bot_config).clone_bots(self.bots)
+        for identity, bot in zip(class_.identities, bots):
+            if not bot.supports_batch:
+                return None
+
+            bot.identity = identity
+            bot.setup()
+        return class_, bots
+
+    def run_vector_batch(self, class_: Type["VectorGameBase"], bots: List[GamePlayer]) -> None:
+        """Run batch of games in lockstep, using GamePlayer.process_batch()."""
+        self.log.info("\n********** Running Vectorised Batch **********\n")
+        assert self.stats, "BUG: Batch not started"
+        num_remaining = self.batch_size - self.num_games_played
+        while num_remaining > 0 and not (self.check_rejected() or self.check_precision()):
+            # Each chunk is seeded from the index of its first game.
+            self.seed_game(self.num_games_played)
+            for bot in bots:
+                bot.reset_for_game()
+
+            num_games = min(num_remaining, self.get_chunk_size())
+            game_obj = class_(num_games, common_random=self.common_random)
+            game_obj.run(bots)
+            self.show_vector_results(game_obj, bots)
+
+            self.stats.add_games(game_obj.outcomes, game_obj.num_turns)
+            num_remaining -= num_games
+        return
+
+    @staticmethod
+    def show_vector_results(game_obj: "VectorGameBase", bots: List[GamePlayer]) -> None:
+        """Let bots see the final result of every game, as SingleGame.show_result() does."""
+        # Most bots ignore results, so skip building the final state of every game for them.
+        result_bots = [bot for bot in bots if type(bot).show_result is not GamePlayer.show_result]
+        if not result_bots:
+            return
+
+        for game_index in range(game_obj.num_games):
+            data = game_obj.get_result_data(game_index)
+            for bot in result_bots:
+                bot.show_result(data)
+        return
+
+    def get_chunk_size(self) -> int:
+        """Get the number of games to run before the batch is next checked for stopping early."""
+        if self.score_threshold is not None:
+            return CHECK_CHUNK_SIZE
+
+        if self.precision is not None:
+            # Run (roughly) the number of games still needed, but stop to
+            # check progress at least every VECTOR_CHUNK_SIZE games.
+            games_needed = self.get_games_needed() - self.num_games_played
+            return min(max(games_needed, CHECK_CHUNK_SIZE), VECTOR_CHUNK_SIZE)
+        return VECTOR_CHUNK_SIZE
+
     def run_magic_batch(self) -> None:
-        """Run normal batch of games."""
-        start_game_obj = GameFactory(self).get_game_obj(self.game)
-        start_game_obj.set_initial_state()
+        """Run every possible game against the magic bot(s)."""
+        self.num_splits = 1
+        self.log.info("\n********** Running magic game {} **********\n".format(self.num_splits))
+        self.run_magic_subtrees(self.get_magic_subtrees(0))
+        return
+
+    def start_magic_game(self) -> Tuple[GameBase, Optional[Callable[[], Hashable]]]:
+        """
+        Create the game and bots for a magic batch, at the initial position.
+
+        :returns: Tuple of (game_obj, get_key). get_key is the function to
+            use for position keys if positions can be merged, as per
+            get_magic_tally(), or None if they cannot.
+        """
+        game_obj = GameFactory(self).get_game_obj(self.game)
+        game_obj.set_initial_state()
         bots = BotFactory(self, bot_config=self.bot_config).clone_bots(self.bots)
+        game_obj.start(bots)
+
+        if not all(bot.magic or bot.deterministic for bot in bots):
+            return game_obj, None
+        if all(bot.symmetric for bot in bots):
+            return game_obj, game_obj.get_canonical_key
+        return game_obj, game_obj.get_position_key
+
+    def get_magic_key(self, game_obj: GameBase, get_key: Callable[[], Hashable]) -> Hashable:
+        """
+        Get a key for the current position and the state of each bot, for set_magic_key().
+
+        :param get_key: Function for the position key, e.g. game_obj.get_position_key.
+        :returns: Tuple of (position key, tuple of GamePlayer.snapshot() for each bot).
+        """
+        return get_key(), tuple(bot.snapshot() for bot in game_obj.bots)
+
+    def set_magic_key(self, game_obj: GameBase, magic_key: Hashable) -> None:
+        """Restore the position and the state of each bot from get_magic_key()."""
+        key, snapshots = magic_key  # type: ignore
+        game_obj.set_position_key(key)
+        for bot, snapshot in zip(game_obj.bots, snapshots):
+            bot.restore(snapshot)
+        return
+
+    def get_magic_subtrees(self, depth: int) -> List[Tuple[Hashable, int]]:
+        """
+        Play the first `depth` moves of every magic game, and get the positions reached.
+
+        Games that finish within `depth` moves are added to the totals. Every
+        other game continues from exactly one of the positions returned, so
+        running run_magic_subtrees() on all of them completes the batch. The
+        positions can be run in any order, and in separate processes.
+
+        :param depth: Number of moves to play.
+        :returns: List of (key, number of games), where each key is from
+            get_magic_key(). Positions are merged as per get_magic_tally() if
+            possible.
+        """
+        assert self.stats, "BUG: Batch not started"
+        game_obj, get_key = self.start_magic_game()
+        merge = get_key is not None
+        if get_key is None:
+            get_key = game_obj.get_position_key
+        buffer = ResultBuffer(self.identities, VECTOR_CHUNK_SIZE)
+
+        subtrees = [(self.get_magic_key(game_obj, get_key), 1)]
+        for _ in range(depth):
+            next_subtrees = []  # type: List[Tuple[Hashable, int]]
+            for magic_key, game_count in subtrees:
+                self.set_magic_key(game_obj, magic_key)
+                if game_obj.is_ended():
+                    game_obj.show_result()
+                    buffer.add(game_obj.get_outcome(), game_obj.num_turns, game_count)
+                    if buffer.is_full():
+                        buffer.flush(self.stats)
+                    continue
 
-        start_game_obj.start(bots)
-        start_game_state = start_game_obj.to_dict()
-        game_stack = collections.deque([start_game_state])
-
-        count = 1
-        self.log.info("\n********** Running magic game {} **********\n".format(count))
-        while game_stack:
-            state = game_stack.popleft()
-            game_obj = GameFactory(self).get_game_obj(self.game)
-            game_obj.set_bots(bots)
-            game_obj.from_dict(state)
-            if game_obj.is_ended():
-                result = game_obj.process_result()
-                self.process_game_result(result)
+                outputs = game_obj.get_outputs()
+                snapshots = [bot.snapshot() for bot in game_obj.bots]
+                for output in outputs:
+                    game_obj.make_move(output)
+                    next_subtrees.append((self.get_magic_key(game_obj, get_key), game_count))
+                    game_obj.unmake_move()
+                    for bot, snapshot in zip(game_obj.bots, snapshots):
+                        bot.restore(snapshot)
+
+            if merge:
+                merged = {}  # type: Dict[Hashable, int]
+                for magic_key, game_count in next_subtrees:
+                    merged[magic_key] = merged.get(magic_key, 0) + game_count
+                next_subtrees = list(merged.items())
+            subtrees = next_subtrees
+
+        buffer.flush(self.stats)
+        return subtrees
+
+    def run_magic_subtrees(self, subtrees: List[Tuple[Hashable, int]]) -> None:
+        """
+        Play out every game from the specified positions, adding to the totals.
+
+        :param subtrees: List of (key, number of games), as per get_magic_subtrees().
+        """
+        assert self.stats, "BUG: Batch not started"
+        game_obj, get_key = self.start_magic_game()
+        buffer = ResultBuffer(self.identities, VECTOR_CHUNK_SIZE)
+        self.progress.start(self.log)
+        self.magic_branches = [[0, len(subtrees)]]
+        memo = {}  # type: Dict[Hashable, Dict[Tuple[int, Tuple[int, ...]], int]]
+        for magic_key, game_count in subtrees:
+            self.set_magic_key(game_obj, magic_key)
+            if get_key:
+                tally = self.get_magic_tally(game_obj, get_key, memo)
+                for (outcome, turns), count in tally.items():
+                    buffer.add(outcome, dict(zip(self.identities, turns)), count * game_count)
+                    if buffer.is_full():
+                        buffer.flush(self.stats)
             else:
-                output_states = game_obj.do_turn()
-                for output_state in output_states:
-                    count += 1
-                    self.log.info("\n********** Running game split {} **********\n".format(count))
-                    game_stack.append(output_state)
+                self.run_magic_branch(game_obj, buffer, game_count)
+            self.magic_branches[0][0] += 1
+        buffer.flush(self.stats)
+        return
+
+    def report_magic_progress(self) -> None:
+        """Report the progress of a magic batch, from the branches done at each level."""
+        frontier_size = 0
+        fraction_done = 0.0
+        scale = 1.0
+        for done, num_branches in self.magic_branches:
+            # One branch at each level is in progress.
+            frontier_size += num_branches - done - 1
+            fraction_done += scale * done / num_branches
+            scale /= num_branches
+        self.progress.report(self.num_splits, frontier_size, self.num_leaves, fraction_done)
+        return
+
+    def get_magic_tally(
+        self,
+        game_obj: GameBase,
+        get_key: Callable[[], Hashable],
+        memo: Dict[Hashable, Dict[Tuple[int, Tuple[int, ...]], int]],
+    ) -> Dict[Tuple[int, Tuple[int, ...]], int]:
+        """
+        Get the results of every game from the current position, depth-first.
+
+        The results only depend on the outcome and number of turns of each
+        game, so they are tallied as a dict of (outcome, turns taken by each
+        identity) to number of games. The tally for each position is
+        remembered in memo, keyed by GameBase.get_position_key(), so a
+        position reached by more than one sequence of moves is only played
+        out once. This is only valid when every bot is magic or deterministic,
+        so that the games play out identically.
+
+        If every bot is also symmetric, positions are keyed by
+        GameBase.get_canonical_key() instead, so that rotations and
+        reflections of a position share a tally too. Symmetric games have the
+        same outcomes and number of turns.
+
+        memo is cleared whenever it reaches magic_memory positions, so that
+        memory use is bounded. This only means some positions are played out
+        again: the tally is the same.
+
+        Each move is applied with make_move() and reverted with unmake_move(),
+        so the game object is unchanged on return.
+
+        :param get_key: Either game_obj.get_position_key or game_obj.get_canonical_key.
+        :param memo: Dict of position key to tally, shared by every call.
+        :returns: The tally. This may be shared with memo, so must not be changed.
+        """
+        key = get_key()
+        tally = memo.get(key)
+        if tally is not None:
+            return tally
+
+        if game_obj.is_ended():
+            self.num_leaves += 1
+            game_obj.show_result()
+            turns = tuple(game_obj.num_turns[identity] for identity in self.identities)
+            tally = {(game_obj.get_outcome(), turns): 1}
+        else:
+            tally = {}
+            outputs = game_obj.get_outputs()
+            branches = [0, len(outputs)]
+            self.magic_branches.append(branches)
+            for output in outputs:
+                self.num_splits += 1
+                if self.progress.is_due():
+                    self.report_magic_progress()
+                game_obj.make_move(output)
+                for result, count in self.get_magic_tally(game_obj, get_key, memo).items():
+                    tally[result] = tally.get(result, 0) + count
+                game_obj.unmake_move()
+                branches[0] += 1
+            self.magic_branches.pop()
+
+        if len(memo) >= self.magic_memory:
+            memo.clear()
+        memo[key] = tally
+        return tally
+
+    def run_magic_branch(
+        self, game_obj: GameBase, buffer: ResultBuffer, game_count: int = 1
+    ) -> None:
+        """
+        Play out every branch from the current game state, depth-first.
+
+        Each move is applied with make_move() and reverted with unmake_move(),
+        so the game object is unchanged on return. Bots may keep state between
+        turns, so where there is more than one move, each bot is restored with
+        GamePlayer.restore() before the next move is played.
+
+        :param buffer: Buffer for the results of finished games.
+        :param game_count: Number of games that reached the current state.
+        """
+        if game_obj.is_ended():
+            self.num_leaves += 1
+            game_obj.show_result()
+            buffer.add(game_obj.get_outcome(), game_obj.num_turns, game_count)
+            if buffer.is_full():
+                assert self.stats, "BUG: Batch not started"
+                buffer.flush(self.stats)
+            return
 
+        outputs = game_obj.get_outputs()
+        snapshots = [bot.snapshot() for bot in game_obj.bots] if len(outputs) > 1 else []
+        branches = [0, len(outputs)]
+        self.magic_branches.append(branches)
+        for output in outputs:
+            self.num_splits += 1
+            if self.progress.is_due():
+                self.report_magic_progress()
+            game_obj.make_move(output)
+            self.run_magic_branch(game_obj, buffer, game_count)
+            game_obj.unmake_move()
+            for bot, snapshot in zip(game_obj.bots, snapshots):
+                bot.restore(snapshot)
+            branches[0] += 1
+        self.magic_branches.pop()
         return
@@ -0,0 +1,216 @@
+"""
+Compact, streaming aggregation of batch results.
+
+Each game is recorded as an outcome code and the number of turns taken by
+each identity. The outcome code is the index of the winning identity plus 1,
+or len(identities) + 1 for a draw, as per VectorGameBase.outcomes.
+
+ResultBuffer collects games in preallocated arrays, and BatchStats folds them
+into running totals. Scores only depend on (num_turns, outcome), so BatchStats
+keeps a count of each distinct score rather than any per-game data. It can be
+summarised at any point, and is small enough to send between processes.
+"""
+
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import math
+
+import numpy as np
+
+# Confidence intervals are 95%, i.e. +/- 1.96 standard errors.
+CONFIDENCE_Z = 1.96
+
+
+class ResultBuffer:
+    """Preallocated arrays for the results of up to `size` games."""
+
+    def __init__(self, identities: Sequence[str], size: int) -> None:
+        """
+        Create a new ResultBuffer.
+
+        :param identities: The identities in the game, in order.
+        :param size: Maximum number of games to hold before flush() is required.
+        """
+        self.identities = list(identities)
+        self.outcomes = np.zeros(size, dtype=np.int8)
+        self.num_turns = np.zeros((size, len(self.identities)), dtype=np.int16)
+        self.game_counts = np.zeros(size, dtype=np.int64)
+        self.count = 0
+        return
+
+    def add(self, outcome: int, num_turns: Mapping[str, int], game_count: int = 1) -> None:
+        """
+        Add the result of a single game.
+
+        :param outcome: The outcome code, as described above.
+        :param num_turns: Number of turns taken by each identity, e.g. GameBase.num_turns.
+        :param game_count: Number of identical games this result stands for.
+        """
+        self.outcomes[self.count] = outcome
+        row = self.num_turns[self.count]
+        for index, identity in enumerate(self.identities):
+            row[index] = num_turns[identity]
+        self.game_counts[self.count] = game_count
+        self.count += 1
+        return
+
+    def is_full(self) -> bool:
+        """Return True if no more games can be added until flush() is called."""
+        return self.count == len(self.outcomes)
+
+    def flush(self, stats: "BatchStats") -> None:
+        """Add every buffered game to the specified stats, and empty the buffer."""
+        stats.add_games(
+            self.outcomes[: self.count],
+            self.num_turns[: self.count],
+            self.game_counts[: self.count],
+        )
+        self.count = 0
+        return
+
+
+class BatchStats:
+    """Running totals for a batch of games."""
+
+    def __init__(
+        self, identities: Sequence[str], calculate_score: Callable[[int, int], float]
+    ) -> None:
+        """
+        Create a new BatchStats object.
+
+        :param identities: The identities in the game, in order.
+        :param calculate_score: Function taking (num_turns, outcome), where
+            outcome is 1 for a win, 0 for a draw or -1 for a loss, and returning
+            the score. Normally SingleGame.calculate_score.
+        """
+        self.identities = list(identities)
+        self.calculate_score = calculate_score
+        self.draw = len(self.identities) + 1
+        self.num_games = 0
+
+        # Number of games with each outcome code. Code 0 (not completed) is unused.
+        self.outcome_counts = np.zeros(self.draw + 1, dtype=np.int64)
+
+        # Number of games with each distinct score, for each identity.
+        self.score_counts = [{} for _ in self.identities]  # type: List[Dict[float, int]]
+        return
+
+    def add_games(
+        self, outcomes: np.ndarray, num_turns: np.ndarray, game_counts: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Add the results of many games.
+
+        :param outcomes: (num_games,) array of outcome codes.
+        :param num_turns: (num_games, num_identities) array of turns taken.
+        :param game_counts: Optional (num_games,) array with the number of
+            identical games each row stands for. Defaults to 1 for every row.
+        """
+        if len(outcomes) == 0:
+            return
+
+        assert (outcomes != 0).all(), "BUG: Only finished games can be added"
+        if game_counts is None:
+            game_counts = np.ones(len(outcomes), dtype=np.int64)
+
+        self.num_games += int(game_counts.sum())
+        self.outcome_counts += np.bincount(
+            outcomes, weights=game_counts, minlength=len(self.outcome_counts)
+        ).astype(np.int64)
+
+        for index, score_counts in enumerate(self.score_counts):
+            wins = outcomes == index + 1
+            draws = outcomes == self.draw
+            player_outcomes = np.where(wins, 1, np.where(draws, 0, -1))
+
+            # Score each distinct (num_turns, outcome) combination once.
+            combos, inverse = np.unique(
+                np.stack([num_turns[:, index], player_outcomes], axis=1),
+                axis=0,
+                return_inverse=True,
+            )
+            counts = np.bincount(inverse.reshape(-1), weights=game_counts).astype(np.int64)
+            for (turns, outcome), count in zip(combos, counts):
+                score = float(self.calculate_score(int(turns), int(outcome)))
+                score_counts[score] = score_counts.get(score, 0) + int(count)
+        return
+
+    def merge(self, other: "BatchStats") -> None:
+        """Add the totals from another BatchStats object, e.g. from one shard of a batch."""
+        assert other.identities == self.identities, "BUG: Cannot merge stats for another game"
+        self.num_games += other.num_games
+        self.outcome_counts += other.outcome_counts
+        for score_counts, other_counts in zip(self.score_counts, other.score_counts):
+            for score, count in other_counts.items():
+                score_counts[score] = score_counts.get(score, 0) + count
+        return
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the totals as a dict of plain values, for sending to another process."""
+        return {
+            "num_games": self.num_games,
+            "outcome_counts": self.outcome_counts.tolist(),
+            "score_counts": [sorted(x.items()) for x in self.score_counts],
+        }
+
+    def from_dict(self, data: Dict[str, Any]) -> None:
+        """Replace the totals with those from to_dict()."""
+        self.num_games = data["num_games"]
+        self.outcome_counts = np.array(data["outcome_counts"], dtype=np.int64)
+        self.score_counts = [dict(x) for x in data["score_counts"]]
+        return
+
+    def get_wins(self, identity: str) -> int:
+        """Get the number of games won by the specified identity."""
+        return int(self.outcome_counts[self.identities.index(identity) + 1])
+
+    def get_draws(self) -> int:
+        """Get the number of drawn games."""
+        return int(self.outcome_counts[self.draw])
+
+    def get_total_score(self, identity: str) -> float:
+        """Get the total score for the specified identity over all games."""
+        score_counts = self.score_counts[self.identities.index(identity)]
+        return sum(score * count for score, count in score_counts.items())
+
+    def get_mean(self, identity: str) -> float:
+        """Get the average score for the specified identity."""
+        assert self.num_games > 0, "BUG: No games played!"
+        return self.get_total_score(identity) / self.num_games
+
+    def get_variance(self, identity: str) -> float:
+        """Get the sample variance of the score for the specified identity."""
+        if self.num_games < 2:
+            return math.inf
+
+        mean = self.get_mean(identity)
+        score_counts = self.score_counts[self.identities.index(identity)]
+        total = sum(count * (score - mean) ** 2 for score, count in score_counts.items())
+        return total / (self.num_games - 1)
+
+    def get_confidence_interval(self, identity: str) -> float:
+        """
+        Get the half-width of the confidence interval for the average score.
+
+        :returns: The half-width, or infinity if fewer than 2 games have been played.
+        """
+        if self.num_games < 2:
+            return math.inf
+        return CONFIDENCE_Z * math.sqrt(self.get_variance(identity) / self.num_games)
+
+    def get_distribution(self, identity: str) -> List[Tuple[float, int]]:
+        """Get every distinct score for the specified identity, with its count, in score order."""
+        return sorted(self.score_counts[self.identities.index(identity)].items())
+
+    def get_histogram(self, identity: str, bins: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a histogram of scores for the specified identity.
+
+        :param bins: Number of equal-width bins.
+        :returns: Tuple of (counts, bin_edges), as per numpy.histogram().
+        """
+        distribution = self.get_distribution(identity)
+        scores = np.array([x[0] for x in distribution], dtype=np.float64)
+        counts = np.array([x[1] for x in distribution], dtype=np.int64)
+        histogram, edges = np.histogram(scores, bins=bins, weights=counts)
+        return histogram.astype(np.int64), edges
@@ -2,10 +2,9 @@
 
 from typing import Any, Callable, Dict, List, Optional
 
-import importlib
-import inspect
 import traceback
 
+from lib import registry
 from lib.errors import BotCreateError
 from lib.gameconfig import GameConfig
 from lib.gamecontext import GameContext
@@ -38,34 +37,7 @@ class BotFactory:
 
     def _get_bot_class(self, module_name: str) -> Optional[Callable]:
         """Get the class name for the bot."""
-        parts = module_name.split(".")
-        game = ""
-        module_basename = module_name
-        if len(parts) > 1:
-            game = parts[0]
-            module_basename = parts[1]
-            full_module_path = "games.{0}.bots.{1}.{1}".format(game, module_basename)
-        else:
-            full_module_path = "bots.{0}.{0}".format(module_name)
-
-        try:
-            module = importlib.import_module(full_module_path)
-        except ImportError as e:
-            raise BotCreateError(
-                "Failed to import bot module '{}': {}".format(full_module_path, e)
-            ) from e
-
-        class_type = None
-        for name, obj in inspect.getmembers(module):
-            if inspect.isclass(obj):
-                if name.lower() == module_basename.lower():
-                    class_type = obj
-                    break
-
-        if not class_type:
-            raise BotCreateError("Failed to find bot class matching: {}".format(module_basename))
-
-        return class_type
+        return registry.get_bot_class(module_name)
 
     def create_bot(self, module_name: str) -> GamePlayer:
         """Create new bot object."""
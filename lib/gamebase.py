@@ -7,13 +7,18 @@ Run games thus:
     game.run()
 """
 import copy
-from typing import Any, Dict, List, Tuple
+import json
+from array import array
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
 
-from lib.errors import GameCreateError
+from lib.errors import GameCreateError, GameError
 from lib.gamecontext import GameContext
 from lib.gameplayer import GamePlayer
 from lib.gameresult import GameResult
 
+# memoryview.toreadonly() is only available in Python 3.8+.
+READONLY_VIEWS = hasattr(memoryview, "toreadonly")
+
 
 class GameBase(GameContext):
     """Base object for a game."""
@@ -21,6 +26,8 @@ class GameBase(GameContext):
     identities = ("1", "2")
     input_count = 0  # This MUST be overridden by subclass.
     output_count = 0  # This MUST be overridden by subclass.
+    # Best possible score for a single game, if known. Used to stop batches early.
+    max_score = None  # type: Optional[float]
 
     def __init__(self) -> None:
         """Create a new GameBase object."""
@@ -28,6 +35,26 @@ class GameBase(GameContext):
         self.bots = []  # type: List[GamePlayer]
         self.num_turns = {}  # type: Dict[str, int]
         self.current_bot_index = 0
+
+        # Stack of (identity, move) for every move applied with make_move().
+        self.move_stack = []  # type: List[Tuple[str, Any]]
+
+        # Preallocated input buffers, one per identity. These are updated in
+        # place as the game progresses, and bots receive a read-only view.
+        # Without read-only views, bots receive a list instead, which is kept
+        # up to date alongside the buffer by set_input().
+        self.input_buffers = {}  # type: Dict[str, array]
+        self.input_views = {}  # type: Dict[str, Sequence[float]]
+        self.input_copies = {}  # type: Dict[str, List[float]]
+        for identity in self.identities:
+            buffer = array("d", [0.0]) * self.input_count
+            self.input_buffers[identity] = buffer
+            if READONLY_VIEWS:
+                self.input_views[identity] = memoryview(buffer).toreadonly()
+            else:
+                inputs = [0.0] * self.input_count
+                self.input_copies[identity] = inputs
+                self.input_views[identity] = inputs
         return
 
     @classmethod
@@ -66,6 +93,8 @@ class GameBase(GameContext):
 
         self.num_turns = {k: 0 for k in self.identities}
         self.current_bot_index = 0
+        self.move_stack = []
+        self.refresh_inputs()
         return
 
     def load_from_state(self, bots: List[GamePlayer], state: Dict[str, Any]) -> None:
@@ -74,39 +103,110 @@ class GameBase(GameContext):
         self.from_dict(state)
         return
 
-    def do_turn(self) -> List[Dict[str, Any]]:
-        """Process one game turn."""
+    def get_outputs(self) -> List[float]:
+        """
+        Ask the current bot for its move(s) in the current position.
+
+        :returns: List of outputs. Magic bots may return several outputs, one
+            for each branch to explore. Other bots return exactly one output.
+        """
         bot = self.bots[self.current_bot_index]
-        self.num_turns[self.current_identity] += 1
         inputs, available_moves = self.get_inputs(self.current_identity)
         assert (
             len(inputs) == self.input_count
         ), "Incorrect number of inputs returned from get_inputs(): Expected {}, got {}".format(
             self.input_count, len(inputs)
         )
-        output_states = []
         if bot.magic:
-            outputs = bot.process_magic(inputs, available_moves)
+            # Copy the outputs, since they may refer to data that changes
+            # when the moves are applied.
+            return list(bot.process_magic(inputs, available_moves))
+        return [bot.process(inputs, available_moves)]
+
+    def make_move(self, output: float) -> None:
+        """
+        Apply the specified output as a move for the current bot.
+
+        The move is pushed onto the move stack, and can be reverted with
+        unmake_move(). No state is serialised, so this is cheap enough to use
+        for search and enumeration.
+        """
+        identity = self.current_identity
+        self.num_turns[identity] += 1
+        move = self.update(identity, output)
+        self.move_stack.append((identity, move))
+
+        self.current_bot_index += 1
+        if self.current_bot_index >= len(self.bots):
+            self.current_bot_index = 0
+        return
+
+    def unmake_move(self) -> None:
+        """Revert the last move applied with make_move()."""
+        assert self.move_stack, "BUG: unmake_move() called with no moves to revert!"
+        identity, move = self.move_stack.pop()
+        self.undo_update(identity, move)
+        self.num_turns[identity] -= 1
+
+        self.current_bot_index -= 1
+        if self.current_bot_index < 0:
+            self.current_bot_index = len(self.bots) - 1
+        return
+
+    def get_position_key(self) -> Hashable:
+        """
+        Get a key identifying the current position, for merging transpositions.
+
+        Games with the same key must have the same state, side to move and
+        number of turns, so that they play out identically from here against
+        deterministic bots. Subclasses should override this with something cheaper.
+        """
+        return json.dumps(self.to_dict(), sort_keys=True)
 
+    def set_position_key(self, key: Hashable) -> None:
+        """
+        Restore the position from a key returned by get_position_key() or get_canonical_key().
+
+        Subclasses that override get_position_key() must override this too.
+        """
+        assert isinstance(key, str), "BUG: set_position_key() not implemented for this key"
+        self.from_dict(json.loads(key))
+        return
+
+    def get_canonical_key(self) -> Hashable:
+        """
+        Get a key identifying the current position and all of its symmetries.
+
+        Positions that are rotations or reflections of each other (or any
+        other symmetry of the game) must have the same key. Games with
+        symmetries should override this; the default has none.
+        """
+        return self.get_position_key()
+
+    def do_turn(self, snapshot: bool = False) -> List[Dict[str, Any]]:
+        """
+        Process one game turn.
+
+        :param snapshot: If True, return a copy of the game state after the
+            move. Magic bots always produce one state per output, and the
+            game is left unchanged.
+        :returns: List of output states. This is empty for a normal move
+            unless snapshot is True.
+        """
+        bot = self.bots[self.current_bot_index]
+        outputs = self.get_outputs()
+        output_states = []
+        if bot.magic:
             # For each output, we apply the move, save the state and add it to the outputs,
             # then revert back to the current state.
-            cur_state = self.to_dict()
             for output in outputs:
-                self.update(self.current_identity, output)
-                self.current_bot_index += 1
-                if self.current_bot_index >= len(self.bots):
-                    self.current_bot_index = 0
-
+                self.make_move(output)
                 output_states.append(copy.deepcopy(self.to_dict()))
-                self.from_dict(cur_state)
+                self.unmake_move()
         else:
-            output = bot.process(inputs, available_moves)
-            self.update(self.current_identity, output)
-
-            self.current_bot_index += 1
-            if self.current_bot_index >= len(self.bots):
-                self.current_bot_index = 0
-            output_states.append(copy.deepcopy(self.to_dict()))
+            self.make_move(outputs[0])
+            if snapshot:
+                output_states.append(copy.deepcopy(self.to_dict()))
         return output_states
 
     def process_result(self) -> GameResult:
@@ -149,8 +249,36 @@ class GameBase(GameContext):
                 self.bots[i].from_dict(bs)
 
         self.set_state(copy.deepcopy(state))
+        self.move_stack = []
+        self.refresh_inputs()
         return
 
+    def refresh_inputs(self) -> None:
+        """Repopulate all input buffers from the current game state."""
+        for identity in self.identities:
+            buffer = self.input_buffers[identity]
+            self.fill_inputs(identity, buffer)
+            if self.input_copies:
+                self.input_copies[identity][:] = buffer.tolist()
+        return
+
+    def set_input(self, identity: str, index: int, value: float) -> None:
+        """Set one input for the specified identity, e.g. from update()."""
+        self.input_buffers[identity][index] = value
+        if self.input_copies:
+            self.input_copies[identity][index] = value
+        return
+
+    def get_input_view(self, identity: str) -> Sequence[float]:
+        """
+        Get the inputs for the specified identity, for passing to a bot.
+
+        This is a read-only view of the input buffer. Where read-only views
+        are not available (Python < 3.8), it is a list kept in step with the
+        buffer instead, so that bots cannot change the game's own inputs.
+        """
+        return self.input_views[identity]
+
     ############################################################################
     # GAME METHODS: Game is defined by the following overridden methods.
     ############################################################################
@@ -167,14 +295,37 @@ class GameBase(GameContext):
         """Get the game state."""
         return {}
 
-    def get_inputs(self, identity: str) -> Tuple[List[float], List[float]]:
-        """Convert current game state into a list of player-specific inputs."""
-        return ([], [])
+    def fill_inputs(self, identity: str, buffer: array) -> None:
+        """
+        Write the full set of player-specific inputs into the specified buffer.
 
-    def update(self, identity: str, output: float) -> None:
-        """Update the current game state based on the specified output."""
+        This is only called when the game state is set from scratch. Subclasses
+        should keep the buffers up to date incrementally in update().
+        """
         return
 
+    def get_inputs(self, identity: str) -> Tuple[Sequence[float], Sequence[float]]:
+        """
+        Get the player-specific inputs and the available moves.
+
+        The inputs are a read-only view of the input buffer for this identity.
+        The view is updated in place, so it is only valid until the next move.
+        """
+        return (self.get_input_view(identity), [])
+
+    def update(self, identity: str, output: float) -> Any:
+        """
+        Update the current game state based on the specified output.
+
+        :returns: The move actually applied. This is passed back to
+            undo_update() by unmake_move().
+        """
+        return None
+
+    def undo_update(self, identity: str, move: Any) -> None:
+        """Revert the move returned by update(). Required for unmake_move()."""
+        raise GameError("{} does not support unmake_move()".format(self.__class__.__name__))
+
     def is_ended(self) -> bool:
         """Return True if the game has ended, otherwise False."""
         return True
@@ -182,3 +333,29 @@ class GameBase(GameContext):
     def get_result(self) -> GameResult:
         """Process and return game result."""
         return GameResult()
+
+    def get_outcome(self) -> int:
+        """
+        Get the outcome of a finished game, without building a GameResult.
+
+        :returns: The index of the winning identity plus 1, or
+            len(identities) + 1 for a draw.
+        """
+        result = self.get_result()
+        if result.is_tie():
+            return len(self.identities) + 1
+        return self.identities.index(result.get_winner()) + 1
+
+    def show_result(self) -> None:
+        """Allow every bot to see the final result. Override in subclass."""
+        return
+
+    def calculate_score(self, num_turns: int, outcome: int) -> float:
+        """
+        Calculate the 'score' for one identity. Override in subclass.
+
+        :param num_turns: The number of turns played.
+        :param outcome: 1 if this player won, 0 for a draw, or -1 for a loss.
+        :returns: The game score, as float.
+        """
+        return float(outcome)
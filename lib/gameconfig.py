@@ -1,6 +1,6 @@
 """Game config object."""
 
-from typing import Any, Callable, Dict, List, Type
+from typing import Any, Callable, Dict, List, Optional, Type
 
 import argparse
 import binascii
@@ -67,12 +67,19 @@ class GameConfig:
         self.genetic_mode = False
         self.use_rabbit = False
         self.magic = False
+        self.magic_memory = None  # type: Optional[int]
+        self.magic_split_depth = None  # type: Optional[int]
+        self.vector = True
         self.no_batch_summary = False
         self.batch_size = 1
+        self.num_workers = 1
+        self.seed = None  # type: Optional[int]
+        self.precision = None  # type: Optional[float]
         self.num_generations = 1
         self.num_samples = 1
         self.keep_samples = 1
         self.wild_samples = 0
+        self.race_batch_size = 0
         self.botdb = False
         self.bot_id = None
         self.bot1 = ""
@@ -114,6 +121,41 @@ class GameConfig:
             action="store_true",
             help="Magic Batch mode. Run all possible games against this bot.",
         )
+        parser.add_argument(
+            "--magic-memory",
+            type=check_int1plus,
+            metavar="POSITIONS",
+            help="Maximum number of positions to remember in a magic batch. "
+            "Lower values use less memory, but replay more repeated positions (Requires --magic)",
+        )
+        parser.add_argument(
+            "--magic-split",
+            type=check_int1plus,
+            metavar="MOVES",
+            help="Number of moves to play before a magic batch is split across processes "
+            "(Requires --magic and --workers)",
+        )
+        parser.add_argument(
+            "--novector",
+            action="store_true",
+            help="Run batch games one at a time, even if both bots support vectorised games.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=check_int1plus,
+            help="Number of processes to split a batch across (Requires --batch or --magic)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=check_int0plus,
+            help="Random seed, to make a batch reproducible (Requires --batch)",
+        )
+        parser.add_argument(
+            "--precision",
+            type=float,
+            help="Stop the batch once the 95%% confidence interval for each average score is "
+            "within +/- PRECISION. --batch is then the maximum number of games",
+        )
         parser.add_argument(
             "--genetic",
             type=check_int1plus,
@@ -135,6 +177,12 @@ class GameConfig:
             help='Number of "wild" (fresh, randomly generated) samples to include '
             "in each generation",
         )
+        parser.add_argument(
+            "--race",
+            type=check_int1plus,
+            help="Racing mode. Start every sample with this many games, then keep the best half "
+            "and double their games, until --keep samples remain (Requires --genetic)",
+        )
         parser.add_argument(
             "--botdb", action="store_true", help="Enable storing and loading bots with BotDB"
         )
@@ -147,15 +195,46 @@ class GameConfig:
             self.magic = True
             if args.batch:
                 parser.error("Cannot specify --batch with --magic")
+            if args.race:
+                parser.error("Cannot specify --race with --magic")
+            if args.precision:
+                parser.error("Cannot specify --precision with --magic")
+
+        if args.precision is not None and args.precision <= 0:
+            parser.error("Option --precision must be greater than 0")
+
+        if args.precision is not None and args.genetic:
+            # Every sample in a generation must play the same number of games.
+            parser.error("Cannot specify --precision with --genetic")
+
+        if args.workers and args.genetic:
+            # Genetic runs already spread their samples across processes.
+            parser.error("Cannot specify --workers with --genetic")
+
+        if args.magic_memory and not args.magic:
+            parser.error("Option --magic-memory requires --magic")
+
+        if args.magic_split and not (args.magic and args.workers):
+            parser.error("Option --magic-split requires --magic and --workers")
 
         if not args.bot1 or not args.bot2:
             print("You need to specify two bots")
             sys.exit(1)
 
         # Check argument dependencies.
-        requires_batch = ["genetic", "samples", "keep", "top", "wild"]
-
-        requires_genetic = ["samples", "keep", "top", "wild"]
+        requires_batch = [
+            "genetic",
+            "samples",
+            "keep",
+            "top",
+            "wild",
+            "race",
+            "workers",
+            "seed",
+            "precision",
+        ]
+
+        requires_genetic = ["samples", "keep", "top", "wild", "race"]
 
         args_dict = vars(args)
         if not args.batch and not self.magic:
@@ -182,6 +261,9 @@ class GameConfig:
         if args.botdb:
             self.botdb = True
 
+        if args.novector:
+            self.vector = False
+
         if args.botid:
             self.bot_id = args.botid
             self.botdb = True
@@ -191,6 +273,21 @@ class GameConfig:
             self.batch_mode = True
             self.silent = True
 
+            if args.workers:
+                self.num_workers = int(args.workers)
+
+            if args.seed is not None:
+                self.seed = int(args.seed)
+
+            if args.magic_memory:
+                self.magic_memory = int(args.magic_memory)
+
+            if args.magic_split:
+                self.magic_split_depth = int(args.magic_split)
+
+            if args.precision:
+                self.precision = float(args.precision)
+
             if args.genetic:
                 self.genetic_mode = True
                 self.no_batch_summary = True
@@ -204,6 +301,9 @@ class GameConfig:
 
                 if args.wild:
                     self.wild_samples = int(args.wild)
+
+                if args.race:
+                    self.race_batch_size = int(args.race)
         return
 
     def init_logging(self) -> None:
@@ -230,6 +330,11 @@ class GameConfig:
             "game": self.game,
             "game_id": self.game_id,
             "magic": self.magic,
+            "magic_memory": self.magic_memory,
+            "magic_split_depth": self.magic_split_depth,
+            "vector": self.vector,
+            "seed": self.seed,
+            "precision": self.precision,
         }
 
     def get_bot_config(self) -> Dict[str, Any]:
@@ -240,4 +345,3 @@ class GameConfig:
             "game": self.game,
             "botdb": self.botdb,
         }
-
@@ -1,15 +1,17 @@
 """Module for managing creation of games."""
 
-from typing import Callable, List, Optional, Type
+from typing import Callable, List, Optional, Type, TYPE_CHECKING
 
-import importlib
 import traceback
 
-from lib.errors import GameCreateError
+from lib import registry
 from lib.gamebase import GameBase
 from lib.gamecontext import GameContext
 from lib.gameplayer import GamePlayer
 
+if TYPE_CHECKING:
+    from lib.vectorgamebase import VectorGameBase
+
 
 class GameFactory:
     """Manage creation of games."""
@@ -25,18 +27,17 @@ class GameFactory:
 
     def get_game_class(self, game: str) -> Type[GameBase]:
         """Get the class for the SingleGame object for the game type."""
-        module_name = "games.{}.singlegame".format(game)
-        try:
-            module = importlib.import_module(module_name)
-        except ImportError as e:
-            raise GameCreateError(
-                "Failed to import game module '{}': {}".format(module_name, e)
-            ) from e
-
-        class_ = getattr(module, "SingleGame")
-        return class_
+        return registry.get_game_class(game)
 
     def get_game_obj(self, game: str) -> GameBase:
         """Get a new instance of the SingleGame object for the game type."""
         class_ = self.get_game_class(game)
         return class_()
+
+    def get_vector_game_class(self, game: str) -> Optional[Type["VectorGameBase"]]:
+        """
+        Get the class for the VectorGame object for the game type.
+
+        :returns: The class, or None if the game has no vectorised version.
+        """
+        return registry.get_vector_game_class(game)
@@ -2,8 +2,9 @@
 
 import copy
 import json
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, Hashable, List, Optional, Sequence, TYPE_CHECKING
 
+import numpy as np
 
 from lib.gamecontext import GameContext
 from lib.gameresult import GameResult
@@ -12,6 +13,10 @@ from lib.globals import log_error
 if TYPE_CHECKING:
     from lib.gamebase import GameBase
 
+# Maximum number of outputs remembered by GamePlayer.process_batch(). Games
+# with many more positions than this (e.g. Connect 4) rarely repeat a position.
+MAX_BATCH_TABLE_SIZE = 20000
+
 
 class GamePlayer(GameContext):
     """Object containing player details."""
@@ -25,6 +30,20 @@ class GamePlayer(GameContext):
 
         # The magic flag is True for bots that use the magic batch runner (e.g. omnibot)
         self.magic = False
+
+        # The deterministic flag is True for bots whose move depends only on
+        # the inputs, i.e. bots with no randomness and no state between turns.
+        self.deterministic = False
+
+        # The symmetric flag is True for bots that play symmetric positions
+        # symmetrically, i.e. the move(s) for a rotated or mirrored position
+        # are the rotated or mirrored move(s). Magic batches only merge
+        # symmetric positions if every bot is symmetric.
+        self.symmetric = False
+
+        # The batch_native flag is True for bots that override process_batch().
+        self.batch_native = False
+        self.batch_table = {}  # type: Dict[bytes, Any]
         self.data = {}  # type: Dict[str, Any]
         self.name = ""
         return
@@ -99,14 +118,101 @@ class GamePlayer(GameContext):
         """Set up this bot. Called before every game."""
         return
 
-    def process(self, inputs: List[float], available_moves: List[float]) -> float:
-        """Process one game turn."""
+    def snapshot(self) -> Hashable:
+        """
+        Get a token for this bot's state within the current game, for restore().
+
+        Magic batches play several moves from the same position, so a bot that
+        keeps state between turns must be put back to how it was at that
+        position before each one. Override this and restore() to support
+        that. The token must be small, immutable and picklable, e.g. a tuple of
+        the attributes that change during a game. By default there is no state.
+        """
+        return None
+
+    def restore(self, token: Hashable) -> None:
+        """Restore this bot's state within the current game, from a token given by snapshot()."""
+        return
+
+    def reset_for_game(self) -> None:
+        """
+        Clear anything left over from the previous game.
+
+        Batches reuse the same bot objects for every game, rather than cloning
+        them each time. This is called before each game (before setup()), so
+        override it to clear any state kept between games.
+        """
+        self.clear_score()
+        return
+
+    def process(self, inputs: Sequence[float], available_moves: Sequence[float]) -> float:
+        """
+        Process one game turn.
+
+        NOTE: inputs is a read-only view that the game updates in place, so
+        copy it if it is needed beyond this call.
+        """
         return 0.0
 
-    def process_magic(self, inputs: List[float], available_moves: List[float]) -> List[float]:
+    def process_magic(
+        self, inputs: Sequence[float], available_moves: Sequence[float]
+    ) -> List[float]:
         """Process one game turn."""
         return [0.0]
 
+    @property
+    def supports_batch(self) -> bool:
+        """Return True if process_batch() can be used to play many games at once."""
+        # The default process_batch() is only safe for bots that keep no state
+        # between turns, since it plays every game with the same bot.
+        return not self.magic and (self.batch_native or self.deterministic)
+
+    def process_batch(self, inputs: np.ndarray, legal_mask: np.ndarray) -> np.ndarray:
+        """
+        Process one game turn for many games at once.
+
+        The default implementation calls process() for each row. Outputs of
+        deterministic bots are remembered in batch_table, so process() is only
+        called once for each distinct row of inputs. Override this (and set
+        batch_native) to process every row at once.
+
+        :param inputs: Matrix with one row of inputs per game, as per process().
+        :param legal_mask: Boolean matrix with one row per game and one column
+            per move, set for every available move. A row with no moves set
+            is for a game that has ended, and its output is ignored.
+        :returns: Array containing one output per game.
+        """
+        playable = legal_mask.any(axis=1)
+        if not playable.all():
+            # Rows without any available moves are for games that have ended.
+            outputs = np.zeros(len(inputs), dtype=np.float64)
+            if playable.any():
+                outputs[playable] = self.process_batch(inputs[playable], legal_mask[playable])
+            return outputs
+
+        if not self.deterministic:
+            outputs = np.empty(len(inputs), dtype=np.float64)
+            for i, (row, legal) in enumerate(zip(inputs, legal_mask)):
+                outputs[i] = self.process(row.tolist(), np.flatnonzero(legal).tolist())
+            return outputs
+
+        unique_inputs, first_index, inverse = np.unique(
+            inputs, axis=0, return_index=True, return_inverse=True
+        )
+
+        outputs = np.empty(len(unique_inputs), dtype=np.float64)
+        for i, row in enumerate(unique_inputs):
+            key = row.tobytes()
+            output = self.batch_table.get(key)
+            if output is None:
+                available_moves = np.flatnonzero(legal_mask[first_index[i]]).tolist()
+                output = self.process(row.tolist(), available_moves)
+                if len(self.batch_table) >= MAX_BATCH_TABLE_SIZE:
+                    self.batch_table.clear()
+                self.batch_table[key] = output
+            outputs[i] = output
+        return outputs[inverse.reshape(-1)]
+
     def show_result(self, data: Any) -> None:
         """Allow bot to see final result."""
         return
@@ -0,0 +1,80 @@
+"""Rate-limited progress reports for long-running searches."""
+
+import datetime
+import math
+import time
+from typing import Optional
+
+from lib.log import LogHandler
+
+# Default maximum number of progress reports per second.
+PROGRESS_MAX_RATE = 1.0
+
+
+class ProgressReporter:
+    """
+    Log the progress of a search, at most max_rate times per second.
+
+    The search calls is_due() as often as it likes, and only builds its
+    report (and calls report()) when it returns True. is_due() is a single
+    clock check, so it is cheap enough for the innermost loop. If the log is
+    not enabled, it always returns False.
+    """
+
+    def __init__(self, max_rate: float = PROGRESS_MAX_RATE) -> None:
+        """
+        Create a new ProgressReporter. Call start() before use.
+
+        :param max_rate: Maximum number of reports per second.
+        """
+        assert max_rate > 0, "BUG: max_rate must be greater than 0"
+        self.log = None  # type: Optional[LogHandler]
+        self.interval = 1.0 / max_rate
+        self.start_time = 0.0
+        self.last_time = 0.0
+        self.last_leaves = 0
+        self.next_time = math.inf
+        return
+
+    def start(self, log: LogHandler) -> None:
+        """Start timing a new search, which reports to the specified log."""
+        self.log = log
+        self.start_time = time.monotonic()
+        self.last_time = self.start_time
+        self.last_leaves = 0
+        self.next_time = self.start_time + self.interval if log.is_enabled else math.inf
+        return
+
+    def is_due(self) -> bool:
+        """Return True if a report is due."""
+        return time.monotonic() >= self.next_time
+
+    def report(
+        self, num_expanded: int, frontier_size: int, num_leaves: int, fraction_done: float
+    ) -> None:
+        """
+        Log a progress report.
+
+        :param num_expanded: Number of states expanded so far.
+        :param frontier_size: Number of states waiting to be expanded.
+        :param num_leaves: Number of leaves (finished games) reached so far.
+        :param fraction_done: Estimate of the fraction of the search completed, from 0 to 1.
+        """
+        assert self.log, "BUG: ProgressReporter not started"
+        now = time.monotonic()
+        leaf_rate = (num_leaves - self.last_leaves) / max(now - self.last_time, 1e-9)
+
+        eta = "unknown"
+        if fraction_done > 0:
+            remaining = (now - self.start_time) * (1 - fraction_done) / fraction_done
+            eta = str(datetime.timedelta(seconds=round(remaining)))
+
+        self.log.info(
+            "Progress: {} states expanded, frontier {}, {:.0f} leaves/sec, "
+            "{:.1%} done, ETA {}".format(num_expanded, frontier_size, leaf_rate, fraction_done, eta)
+        )
+
+        self.last_time = now
+        self.last_leaves = num_leaves
+        self.next_time = now + self.interval
+        return
@@ -0,0 +1,188 @@
+"""
+Process-wide registry of bot and game classes.
+
+Bot names (e.g. "randombot" or "naughts.minimaxbot") and game names (e.g.
+"naughts") are resolved to classes the first time they are used, and cached
+for the life of the process. After that, looking up a class is a single dict
+lookup.
+
+The registry can also be pre-populated from a manifest, which lists the
+module and class name of every bot and game. Generate the manifest with:
+
+    python -m lib.registry
+
+Entry points load the manifest (if present) on startup with load_manifest().
+"""
+
+from typing import Dict, Optional, Type, TYPE_CHECKING
+
+import importlib
+import inspect
+import json
+import os
+import sys
+
+from lib.errors import BotCreateError, GameCreateError
+
+if TYPE_CHECKING:
+    from lib.gamebase import GameBase
+    from lib.gameplayer import GamePlayer
+    from lib.vectorgamebase import VectorGameBase
+
+BASE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MANIFEST_PATH = os.path.join(BASE_PATH, "data", "manifest.json")
+
+_bot_classes = {}  # type: Dict[str, Type[GamePlayer]]
+_game_classes = {}  # type: Dict[str, Type[GameBase]]
+_vector_game_classes = {}  # type: Dict[str, Optional[Type[VectorGameBase]]]
+
+
+def get_bot_module_path(bot_name: str) -> str:
+    """Get the full module path for the specified bot name."""
+    parts = bot_name.split(".")
+    if len(parts) > 1:
+        return "games.{0}.bots.{1}.{1}".format(parts[0], parts[1])
+    return "bots.{0}.{0}".format(bot_name)
+
+
+def find_bot_class(bot_name: str) -> Type["GamePlayer"]:
+    """Import the module for the specified bot, and find the bot class."""
+    module_path = get_bot_module_path(bot_name)
+    module_basename = bot_name.split(".")[-1]
+    try:
+        module = importlib.import_module(module_path)
+    except ImportError as e:
+        raise BotCreateError("Failed to import bot module '{}': {}".format(module_path, e)) from e
+
+    for name, obj in inspect.getmembers(module):
+        if inspect.isclass(obj) and name.lower() == module_basename.lower():
+            return obj
+
+    raise BotCreateError("Failed to find bot class matching: {}".format(module_basename))
+
+
+def get_bot_class(bot_name: str) -> Type["GamePlayer"]:
+    """Get the class for the specified bot name."""
+    class_ = _bot_classes.get(bot_name)
+    if class_ is None:
+        class_ = find_bot_class(bot_name)
+        _bot_classes[bot_name] = class_
+    return class_
+
+
+def get_game_class(game: str) -> Type["GameBase"]:
+    """Get the SingleGame class for the specified game."""
+    class_ = _game_classes.get(game)
+    if class_ is None:
+        module_name = "games.{}.singlegame".format(game)
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            raise GameCreateError(
+                "Failed to import game module '{}': {}".format(module_name, e)
+            ) from e
+
+        class_ = getattr(module, "SingleGame")
+        _game_classes[game] = class_
+    return class_
+
+
+def get_vector_game_class(game: str) -> Optional[Type["VectorGameBase"]]:
+    """Get the VectorGame class for the specified game, or None if it has none."""
+    if game not in _vector_game_classes:
+        module_name = "games.{}.vectorgame".format(game)
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            # Only a missing vectorgame module means there is no vectorised
+            # game. Errors from inside it must not be hidden.
+            if e.name != module_name:
+                raise
+            _vector_game_classes[game] = None
+        else:
+            _vector_game_classes[game] = getattr(module, "VectorGame")
+    return _vector_game_classes[game]
+
+
+def _get_class_path(class_: type) -> str:
+    """Get the "module:ClassName" path for the specified class."""
+    return "{}:{}".format(class_.__module__, class_.__name__)
+
+
+def _load_class_path(class_path: str) -> type:
+    """Load a class from its "module:ClassName" path."""
+    module_name, class_name = class_path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def generate_manifest() -> Dict[str, Dict[str, Optional[str]]]:
+    """Find every bot and game, and return the manifest as a dict."""
+    manifest = {
+        "bots": {},
+        "games": {},
+        "vector_games": {},
+    }  # type: Dict[str, Dict[str, Optional[str]]]
+
+    bot_dirs = [("", os.path.join(BASE_PATH, "bots"))]
+    games_path = os.path.join(BASE_PATH, "games")
+    for game in sorted(os.listdir(games_path)):
+        if not os.path.isfile(os.path.join(games_path, game, "singlegame.py")):
+            continue
+
+        manifest["games"][game] = _get_class_path(get_game_class(game))
+        vector_class = get_vector_game_class(game)
+        manifest["vector_games"][game] = vector_class and _get_class_path(vector_class)
+        bot_dirs.append((game + ".", os.path.join(games_path, game, "bots")))
+
+    for prefix, path in bot_dirs:
+        for name in sorted(os.listdir(path)):
+            if os.path.isfile(os.path.join(path, name, name + ".py")):
+                bot_name = prefix + name
+                manifest["bots"][bot_name] = _get_class_path(get_bot_class(bot_name))
+    return manifest
+
+
+def write_manifest(path: str = MANIFEST_PATH) -> None:
+    """Generate the manifest and write it to the specified path."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(generate_manifest(), f, indent=2, sort_keys=True)
+    return
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> bool:
+    """
+    Pre-populate the registry from the manifest at the specified path.
+
+    Entries that can no longer be loaded are skipped, and will be resolved
+    (or reported) as normal on first use.
+
+    :returns: True if the manifest was loaded, or False if it does not exist.
+    """
+    if not os.path.isfile(path):
+        return False
+
+    with open(path, "r") as f:
+        manifest = json.load(f)
+
+    for registry, key in (
+        (_bot_classes, "bots"),
+        (_game_classes, "games"),
+        (_vector_game_classes, "vector_games"),
+    ):
+        for name, class_path in manifest.get(key, {}).items():
+            if class_path is None:
+                registry[name] = None
+                continue
+
+            try:
+                registry[name] = _load_class_path(class_path)
+            except (ImportError, AttributeError, ValueError):
+                continue
+    return True
+
+
+if __name__ == "__main__":
+    manifest_path = sys.argv[1] if len(sys.argv) > 1 else MANIFEST_PATH
+    write_manifest(manifest_path)
+    print("Manifest written to {}".format(manifest_path))
@@ -1,10 +1,69 @@
 """Game Runner for a batch of games."""
 
+import functools
+import math
+import multiprocessing
+import os
+from typing import Any, Dict, Hashable, List, Tuple
+
+import numpy as np
+
 from lib.batch import Batch
 from lib.botfactory import BotFactory
+from lib.gamecontext import GameContext
 from lib.runners.gamerunnerbase import GameRunnerBase
 
 
+def start_worker_batch(bot_data: List[Dict[str, Any]], batch_config: Dict[str, Any]) -> Batch:
+    """
+    Create the bots and start a batch, in a worker process.
+
+    :param bot_data: List containing to_dict() for each bot.
+    :param batch_config: Batch config for the worker's part of the batch.
+    """
+    context = GameContext()
+    bot_factory = BotFactory(context, bot_config=batch_config.get("bot_config", {}))
+
+    bots = []
+    for data in bot_data:
+        bot = bot_factory.create_bot(data.get("name", ""))
+        bot.from_dict(data)
+        bots.append(bot)
+
+    batch = Batch(bots, batch_config)
+    batch.start_batch()
+    return batch
+
+
+def run_batch_shard(bot_data: List[Dict[str, Any]], batch_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one shard of a batch, in a worker process.
+
+    :param bot_data: List containing to_dict() for each bot.
+    :param batch_config: Batch config for this shard only.
+    :returns: The shard totals, as per Batch.get_totals().
+    """
+    batch = start_worker_batch(bot_data, batch_config)
+    batch.run_games()
+    return batch.get_totals()
+
+
+def run_magic_subtree(
+    bot_data: List[Dict[str, Any]], batch_config: Dict[str, Any], subtree: Tuple[Hashable, int]
+) -> Dict[str, Any]:
+    """
+    Play out one subtree of a magic batch, in a worker process.
+
+    :param bot_data: List containing to_dict() for each bot.
+    :param batch_config: Batch config for the whole magic batch.
+    :param subtree: Tuple of (key, number of games), as per Batch.get_magic_subtrees().
+    :returns: The subtree totals, as per Batch.get_totals().
+    """
+    batch = start_worker_batch(bot_data, batch_config)
+    batch.run_magic_subtrees([subtree])
+    return batch.get_totals()
+
+
 class BatchRunner(GameRunnerBase):
     """Batch game runner."""
 
@@ -15,5 +74,72 @@ class BatchRunner(GameRunnerBase):
 
         batch = Batch(bots=bots, batch_config=self.config.get_batch_config())
         batch.log.log_to_console()
-        batch.run_batch()
+        if self.config.num_workers > 1 and batch.magic:
+            self.run_magic_parallel(batch)
+        elif self.config.num_workers > 1 and batch.batch_size > 1:
+            self.run_sharded(batch)
+        else:
+            batch.run_batch()
+        return
+
+    def run_sharded(self, batch: Batch) -> None:
+        """Split the batch into shards, run them in parallel and merge the results."""
+        num_shards = min(self.config.num_workers, batch.batch_size)
+
+        # Each shard gets its own independent seed, derived from the batch seed.
+        # The batch seed is logged so that the whole run can be reproduced.
+        seed = batch.seed
+        if seed is None:
+            seed = int.from_bytes(os.urandom(4), "little")
+        self.log.info("Running {} shards with seed {}".format(num_shards, seed))
+        shard_seeds = [
+            int(x.generate_state(1)[0]) for x in np.random.SeedSequence(seed).spawn(num_shards)
+        ]
+
+        bot_data = [bot.to_dict() for bot in batch.bots]
+        shard_args = []
+        for index in range(num_shards):
+            shard_config = dict(batch.batch_config)
+            shard_config["batch_size"] = len(range(index, batch.batch_size, num_shards))
+            shard_config["seed"] = shard_seeds[index]
+            if batch.precision is not None:
+                # The merged interval is narrower by sqrt(num_shards).
+                shard_config["precision"] = batch.precision * math.sqrt(num_shards)
+            shard_args.append((bot_data, shard_config))
+
+        batch.start_batch()
+        with multiprocessing.Pool(num_shards) as pool:
+            for totals in pool.starmap(run_batch_shard, shard_args):
+                batch.merge_totals(totals)
+        batch.process_batch_result()
+        return
+
+    def run_magic_parallel(self, batch: Batch) -> None:
+        """Split a magic batch into subtrees, play them out in parallel and merge the results."""
+        batch.start_batch()
+        subtrees = batch.get_magic_subtrees(batch.magic_split_depth)
+        self.log.info(
+            "Running {} magic subtrees across {} workers".format(
+                len(subtrees), self.config.num_workers
+            )
+        )
+
+        # Subtrees vary a lot in size, so hand them out one at a time as
+        # workers become free, rather than in fixed shares.
+        bot_data = [bot.to_dict() for bot in batch.bots]
+        run_subtree = functools.partial(run_magic_subtree, bot_data, batch.batch_config)
+        batch.progress.start(batch.log)
+        with multiprocessing.Pool(self.config.num_workers) as pool:
+            for index, totals in enumerate(pool.imap_unordered(run_subtree, subtrees)):
+                batch.merge_totals(totals)
+                if batch.progress.is_due():
+                    # Only whole subtrees are seen here, so report those (and
+                    # the games in them) rather than the states inside them.
+                    batch.progress.report(
+                        index + 1,
+                        len(subtrees) - index - 1,
+                        batch.num_games_played,
+                        (index + 1) / len(subtrees),
+                    )
+        batch.process_batch_result()
         return
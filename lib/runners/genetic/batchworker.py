@@ -35,6 +35,7 @@ class BatchWorker(multiprocessing.Process):
         try:
             for batch in self.batches:
                 genetic_index = batch.info["index"]
+                batch.set_score_threshold(genetic_index, self.score_threshold)
                 batch_result = batch.run_batch()
 
                 genetic_identity = batch.identities[genetic_index]
@@ -45,7 +46,9 @@ class BatchWorker(multiprocessing.Process):
                     {
                         "bot_data": batch.bots[genetic_index].to_dict(),
                         "genetic_score": genetic_score,
+                        "num_games": batch.num_games_played,
                         "sample": sample_index,
+                        "totals": batch.get_totals(),
                     }
                 )
 
@@ -98,6 +101,7 @@ class BatchWorkerIsolated(multiprocessing.Process):
                 batch = Batch(bots, batch_config)
 
                 genetic_index = batch_data.get("genetic_index", 0)
+                batch.set_score_threshold(genetic_index, self.score_threshold)
                 batch_result = batch.run_batch()
 
                 genetic_identity = batch.identities[genetic_index]
@@ -108,8 +112,8 @@ class BatchWorkerIsolated(multiprocessing.Process):
                     win = "*"
 
                 print(
-                    "Completed batch for sample {:5d} :: score = {:.3f} {}".format(
-                        batch_data.get("sample", 0), genetic_score, win
+                    "Completed batch for sample {:5d} :: score = {:.3f} ({} games) {}".format(
+                        batch_data.get("sample", 0), genetic_score, batch.num_games_played, win
                     )
                 )
 
@@ -117,6 +121,7 @@ class BatchWorkerIsolated(multiprocessing.Process):
                     {
                         "bot_data": batch.bots[genetic_index].to_dict(),
                         "genetic_score": genetic_score,
+                        "num_games": batch.num_games_played,
                     }
                 )
 
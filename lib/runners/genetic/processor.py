@@ -1,8 +1,11 @@
 """Process batches for all samples."""
 
 import multiprocessing
+import random
 import time
-from typing import Any, Dict, Iterable, Iterator, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
 
 from lib.batch import Batch
 from lib.gamecontext import GameContext
@@ -28,30 +31,77 @@ class Processor:
         self.batch_config = batch_config
         self.genetic_index = genetic_index
         self.rabbit = rabbit
+
+        # Every generation gets its own seed, derived from this one.
+        self.seed = batch_config.get("seed")
+        if self.seed is None:
+            self.seed = random.getrandbits(32)
+        self.context.log.info("Genetic seed: {}".format(self.seed))
         return
 
+    def get_generation_config(
+        self, generation_index: int, batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the batch config for every sample in the specified generation.
+
+        All samples in a generation share the same seed, with common_random
+        set, so every sample faces the same random draws from the other bot,
+        game for game. This removes most of the luck from the comparison.
+
+        :param batch_size: Number of games per sample, if not the configured batch size.
+        """
+        batch_config = dict(self.batch_config)
+        if batch_size is not None:
+            batch_config["batch_size"] = batch_size
+        seed_sequence = np.random.SeedSequence([self.seed, generation_index])
+        batch_config["seed"] = int(seed_sequence.generate_state(1)[0])
+        batch_config["common_random"] = True
+        return batch_config
+
+    @staticmethod
+    def get_sample_config(
+        batch_config: Dict[str, Any], index: int, totals: Optional[Sequence[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Get the batch config for one sample, carrying on from its totals if given."""
+        if not totals:
+            return batch_config
+        return dict(batch_config, totals=totals[index])
+
     def run(
-        self, samples: Iterable[GamePlayer], generation_index: int, score_threshold: float
+        self,
+        samples: Iterable[GamePlayer],
+        generation_index: int,
+        score_threshold: float,
+        batch_size: Optional[int] = None,
+        totals: Optional[Sequence[Dict[str, Any]]] = None,
     ) -> Iterator[Dict[str, Any]]:
         """
         Process the specified samples.
 
         This is also a generator, allowing for the processed batches to be
         collected as we go.
+
+        :param totals: Totals from games each sample has already played (as
+            returned in a previous result), one per sample. Each batch then
+            only plays the rest of its games.
         """
+        batch_config = self.get_generation_config(generation_index, batch_size)
         for index, sample in enumerate(samples):
             if self.genetic_index == 0:
                 bot_list = [sample, self.other_bot]
             else:
                 bot_list = [self.other_bot, sample]
 
-            batch = Batch(bots=bot_list, batch_config=self.batch_config)
+            sample_config = self.get_sample_config(batch_config, index, totals)
+            batch = Batch(bots=bot_list, batch_config=sample_config)
             batch.label = "Gen {} - Sample {}".format(generation_index, index)
             batch.info = {
                 "generation": generation_index,
                 "sample": index,
                 "index": self.genetic_index,
             }
+            batch.set_score_threshold(self.genetic_index, score_threshold)
 
             batch_result = batch.run_batch()
 
@@ -62,7 +112,9 @@ class Processor:
             yield {
                 "bot_data": batch.bots[self.genetic_index].to_dict(),
                 "genetic_score": genetic_score,
+                "num_games": batch.num_games_played,
                 "sample": index,
+                "totals": batch.get_totals(),
             }
         return
 
@@ -88,7 +140,12 @@ class ProcessorMP(Processor):
         return
 
     def run(
-        self, samples: Iterable[GamePlayer], generation_index: int, score_threshold: float
+        self,
+        samples: Iterable[GamePlayer],
+        generation_index: int,
+        score_threshold: float,
+        batch_size: Optional[int] = None,
+        totals: Optional[Sequence[Dict[str, Any]]] = None,
     ) -> Iterator[Dict[str, Any]]:
         """
         Process the specified samples.
@@ -105,6 +162,7 @@ class ProcessorMP(Processor):
         for i in range(self.num_workers):
             worker_inputs[i] = []
 
+        batch_config = self.get_generation_config(generation_index, batch_size)
         for index, sample in enumerate(samples):
             if self.genetic_index == 0:
                 bot_list = [sample, self.other_bot]
@@ -113,7 +171,8 @@ class ProcessorMP(Processor):
 
             qindex = index % self.num_workers
 
-            batch = Batch(bots=bot_list, batch_config=self.batch_config)
+            sample_config = self.get_sample_config(batch_config, index, totals)
+            batch = Batch(bots=bot_list, batch_config=sample_config)
             batch.label = "Gen {} - Sample {}".format(generation_index, index)
             batch.info = {
                 "generation": generation_index,
@@ -151,7 +210,12 @@ class ProcessorRabbit(Processor):
     """
 
     def run(
-        self, samples: Iterable[GamePlayer], generation_index: int, score_threshold: float
+        self,
+        samples: Iterable[GamePlayer],
+        generation_index: int,
+        score_threshold: float,
+        batch_size: Optional[int] = None,
+        totals: Optional[Sequence[Dict[str, Any]]] = None,
     ) -> Iterator[Dict[str, Any]]:
         """
         Process the specified samples by farming them out to rabbitmq.
@@ -165,6 +229,7 @@ class ProcessorRabbit(Processor):
         qid = "{}-{}".format(game_id, generation_index)
         self.rabbit.create_output_queue(qid=qid)
 
+        batch_config = self.get_generation_config(generation_index, batch_size)
         count = 0
         for index, sample in enumerate(samples):
             if self.genetic_index == 0:
@@ -177,7 +242,7 @@ class ProcessorRabbit(Processor):
                     "qid": qid,
                     "bot_data": [x.to_dict() for x in bot_list],
                     "genetic_index": self.genetic_index,
-                    "batch_config": self.batch_config,
+                    "batch_config": self.get_sample_config(batch_config, index, totals),
                     "score_threshold": score_threshold,
                     "sample": index,
                 }
@@ -202,4 +267,3 @@ class ProcessorRabbit(Processor):
             yield body
             self.rabbit.done_message(tag)
         return
-
@@ -20,21 +20,24 @@ def run_one_batch(batch_data: Dict[str, Any]) -> Dict[str, Any]:
         bot.from_dict(bot_data)
         bots.append(bot)
 
+    genetic_index = batch_data.get("genetic_index", 0)
+    score_threshold = batch_data.get("score_threshold", 0)
+
     batch = Batch(bots, batch_config)
+    batch.set_score_threshold(genetic_index, score_threshold)
     batch_result = batch.run_batch()
 
-    genetic_index = batch_data.get("genetic_index", 0)
     genetic_identity = batch.identities[genetic_index]
     genetic_score = batch_result.get_score(genetic_identity)
     sample_index = batch_data.get("sample", 0)
 
     win = ""
-    if genetic_score > batch_data.get("score_threshold", 0):
+    if genetic_score > score_threshold:
         win = "*"
 
     print(
-        "Completed batch for sample {:5d} :: score = {:.3f} {}".format(
-            batch_data.get("sample", 0), genetic_score, win
+        "Completed batch for sample {:5d} :: score = {:.3f} ({} games) {}".format(
+            batch_data.get("sample", 0), genetic_score, batch.num_games_played, win
         )
     )
 
@@ -42,6 +45,7 @@ def run_one_batch(batch_data: Dict[str, Any]) -> Dict[str, Any]:
         "qid": batch_data.get("qid", "test"),
         "bot_data": batch.bots[genetic_index].to_dict(),
         "genetic_score": genetic_score,
+        "num_games": batch.num_games_played,
         "sample": sample_index,
+        "totals": batch.get_totals(),
     }
-
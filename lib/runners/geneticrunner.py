@@ -4,7 +4,7 @@ import itertools
 import json
 import os
 import time
-from typing import Callable, Iterator, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from lib.botfactory import BotFactory
 from lib.gameconfig import GameConfig
@@ -112,25 +112,41 @@ class GeneticRunner(GameRunnerBase):
                     new_samples, self.generate_original_samples(gen, count=self.wild_samples)
                 )
 
+            if self.config.race_batch_size:
+                batch_results = self.race_samples(processor, new_samples, gen, score_threshold)
+            else:
+                batch_results = processor.run(
+                    samples=new_samples, generation_index=gen, score_threshold=score_threshold
+                )
+
             genetic_pool = []
-            for batch_result in processor.run(
-                samples=new_samples, generation_index=gen, score_threshold=score_threshold
-            ):
+            num_games = 0
+            for batch_result in batch_results:
                 sample = self.bot_factory.create_bot(self.genetic_name)
                 sample.from_dict(batch_result["bot_data"])
                 sample.score = batch_result["genetic_score"]
                 genetic_pool.append(sample)
+                num_games += batch_result.get("num_games", self.config.batch_size)
 
                 win = ""
                 if sample.score > score_threshold:
                     win = "*"
 
                 self.log.debug(
-                    "Completed batch for sample {:5d} :: score = {:.3f} {}".format(
-                        batch_result["sample"], sample.score, win
+                    "Completed batch for sample {:5d} :: score = {:.3f} ({} games) {}".format(
+                        batch_result["sample"],
+                        sample.score,
+                        batch_result.get("num_games", self.config.batch_size),
+                        win,
                     )
                 )
 
+            self.log.info(
+                "Generation {} :: {} games played for {} samples".format(
+                    gen, num_games, len(genetic_pool)
+                )
+            )
+
             # Sort the pool based on score, in descending order.
             filtered_pool = list(filter(lambda bot: bot.score > score_threshold, genetic_pool))
 
@@ -180,6 +196,65 @@ class GeneticRunner(GameRunnerBase):
         self.log.info("Completed in {:.2f} seconds".format(duration))
         return
 
+    def race_samples(
+        self,
+        processor: Processor,
+        samples: Iterable[GamePlayer],
+        generation_index: int,
+        score_threshold: float,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Race the samples against each other, and get the results for the survivors.
+
+        Every sample plays race_batch_size games. The best half then play
+        twice as many games, and so on, until only keep_samples remain or the
+        batches reach full size. The survivors then play a full batch, and
+        those results are returned.
+
+        Survivors keep their totals from each round, and only play the games
+        they have not played yet.
+        """
+        pool = list(samples)
+        totals = None  # type: Optional[List[Dict[str, Any]]]
+        batch_size = self.config.race_batch_size
+        keep = self.config.keep_samples
+        while batch_size < self.config.batch_size and len(pool) > keep:
+            # Don't reject samples early here: scores are only compared to each other.
+            batch_results = list(
+                processor.run(
+                    samples=pool,
+                    generation_index=generation_index,
+                    score_threshold=float("-inf"),
+                    batch_size=batch_size,
+                    totals=totals,
+                )
+            )
+            batch_results.sort(key=lambda x: x["genetic_score"], reverse=True)
+
+            num_survivors = max(keep, (len(pool) + 1) // 2)
+            self.log.info(
+                "Generation {} :: raced {} samples over {} games, keeping {}".format(
+                    generation_index, len(pool), batch_size, num_survivors
+                )
+            )
+
+            pool = []
+            totals = []
+            for batch_result in batch_results[:num_survivors]:
+                sample = self.bot_factory.create_bot(self.genetic_name)
+                sample.from_dict(batch_result["bot_data"])
+                pool.append(sample)
+                totals.append(batch_result["totals"])
+            batch_size *= 2
+
+        yield from processor.run(
+            samples=pool,
+            generation_index=generation_index,
+            score_threshold=score_threshold,
+            totals=totals,
+        )
+        return
+
     def generate_samples(
         self, input_samples: List[GamePlayer], generation: int
     ) -> Iterator[GamePlayer]:
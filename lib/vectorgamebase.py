@@ -0,0 +1,121 @@
+"""
+Base vectorised game object, for running many games in lockstep.
+
+All games start together and the players take turns, so at every ply the
+same identity is to move in every game that has not yet finished. Games
+store their state in NumPy arrays with one row per game.
+
+Run games thus:
+    game = VectorGameBase(num_games)  # Actually you would use a subclass here.
+    game.run(bots)
+"""
+
+from typing import Any, List, Tuple
+
+import numpy as np
+
+from lib.batch import DRAW
+from lib.gameplayer import GamePlayer
+
+# Values for VectorGameBase.outcomes, along with the index of the winning
+# identity plus 1, or DRAW.
+NOT_COMPLETED = 0
+
+
+class VectorGameBase:
+    """Base object for a vectorised game."""
+
+    identities = ("1", "2")
+    input_count = 0  # This MUST be overridden by subclass.
+    output_count = 0  # This MUST be overridden by subclass.
+
+    def __init__(self, num_games: int, common_random: bool = False) -> None:
+        """
+        Create a new VectorGameBase object, for the specified number of games.
+
+        :param common_random: If True, bots are asked for a move in every game
+            on every turn, even games that have finished (whose moves are
+            ignored). Random draws then line up by game, so a random bot makes
+            the same draws in each game no matter how the other games go.
+        """
+        self.num_games = num_games
+        self.common_random = common_random
+        self.num_turns = np.zeros((num_games, len(self.identities)), dtype=np.int16)
+
+        # Outcome of each game, as per SingleGame.get_game_state().
+        # 0 = Not completed, 1 = first identity wins, 2 = second identity wins, 3 = draw.
+        self.outcomes = np.zeros(num_games, dtype=np.int8)
+        self.current_bot_index = 0
+        return
+
+    def run(self, bots: List[GamePlayer]) -> None:
+        """Run all games to completion, using GamePlayer.process_batch() for every turn."""
+        assert len(bots) == len(self.identities), "Expected one bot per identity"
+
+        while True:
+            active = np.flatnonzero(self.outcomes == NOT_COMPLETED)
+            if not len(active):
+                break
+
+            index = self.current_bot_index
+            if self.common_random:
+                inputs, legal_mask = self.get_inputs(np.arange(self.num_games), index)
+                legal_mask[self.outcomes != NOT_COMPLETED] = False
+                outputs = bots[index].process_batch(inputs, legal_mask)[active]
+                legal_mask = legal_mask[active]
+            else:
+                inputs, legal_mask = self.get_inputs(active, index)
+                outputs = bots[index].process_batch(inputs, legal_mask)
+            moves = self.get_closest_moves(outputs, legal_mask)
+
+            self.num_turns[active, index] += 1
+            self.update(active, index, moves)
+
+            self.current_bot_index += 1
+            if self.current_bot_index >= len(self.identities):
+                self.current_bot_index = 0
+        return
+
+    @staticmethod
+    def get_closest_moves(outputs: np.ndarray, legal_mask: np.ndarray) -> np.ndarray:
+        """Get the closest legal move to each output, as per SingleGame.update()."""
+        diff = np.abs(np.arange(legal_mask.shape[1]) - outputs.reshape(-1, 1).astype(np.float64))
+        diff[~legal_mask] = np.inf
+        return diff.argmin(axis=1)
+
+    ############################################################################
+    # GAME METHODS: Game is defined by the following overridden methods.
+    ############################################################################
+
+    def get_inputs(self, active: np.ndarray, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the inputs and legal moves for the specified games.
+
+        :param active: Indexes of the games to get inputs for.
+        :param index: Index of the identity to move.
+        :returns: Tuple of (inputs, legal_mask). Inputs has one row per game,
+            in the same format as SingleGame.get_inputs(). legal_mask has one
+            row per game and one column per move.
+        """
+        inputs = np.zeros((len(active), self.input_count), dtype=np.float64)
+        legal_mask = np.zeros((len(active), self.output_count), dtype=bool)
+        return inputs, legal_mask
+
+    def update(self, active: np.ndarray, index: int, moves: np.ndarray) -> None:
+        """
+        Apply moves to the specified games, and update self.outcomes.
+
+        :param active: Indexes of the games to update.
+        :param index: Index of the identity to move.
+        :param moves: One legal move per game.
+        """
+        self.outcomes[active] = DRAW
+        return
+
+    def get_result_data(self, game_index: int) -> Any:
+        """
+        Get the final state of the specified game, as passed to GamePlayer.show_result().
+
+        This should match the data SingleGame.show_result() passes to bots.
+        """
+        return None
@@ -6,6 +6,7 @@ import os
 import sys
 import time
 
+from lib import registry
 from lib.runners.genetic.rabbit import RabbitDisabledError, RabbitManager
 from lib.runners.genetic.rabbitbatchworker import run_one_batch
 
@@ -50,6 +51,9 @@ def consume():
 
 if __name__ == "__main__":
     print("Starting Rabbit Workers...")
+    if registry.load_manifest():
+        print("Loaded manifest from {}".format(registry.MANIFEST_PATH))
+
     try:
         num_workers = int(sys.argv[1])
     except ValueError:
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+"""
+Unit test for running and merging batches.
+
+cd ..
+python -m unittest -v test_batch.py
+"""
+
+
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from bots.omnibot.omnibot import OmniBot
+from bots.randombot.randombot import RandomBot
+from lib.batch import Batch
+from lib.batchstats import BatchStats
+from lib.botfactory import BotFactory
+from lib.gamecontext import GameContext
+from lib.gameplayer import GamePlayer
+from lib.runners.batchrunner import run_batch_shard, run_magic_subtree
+
+
+def get_bot_data():
+    """Get the data for two randombots."""
+    bot_data = []
+    for _ in range(2):
+        bot = RandomBot()
+        bot.name = "randombot"
+        bot_data.append(bot.to_dict())
+    return bot_data
+
+
+def get_batch_config(batch_size, seed, vector=True):
+    """Get the config for a batch of randombot against randombot."""
+    return {
+        "batch_size": batch_size,
+        "bot_config": {"bot_names": ["randombot", "randombot"], "game": "naughts"},
+        "game": "naughts",
+        "seed": seed,
+        "vector": vector,
+    }
+
+
+def get_magic_batch(bot_names):
+    """Get a magic batch for the specified bots, playing naughts."""
+    batch_config = {
+        "bot_config": {"bot_names": bot_names, "game": "naughts"},
+        "game": "naughts",
+        "magic": True,
+    }
+    bots = BotFactory(GameContext(), bot_config=batch_config["bot_config"]).create_bots()
+    return Batch(bots, batch_config)
+
+
+class CountingBot(GamePlayer):
+    """Bot that picks its move from the number of turns it has taken, kept as state."""
+
+    def __init__(self):
+        """Create a new CountingBot."""
+        super().__init__()
+        self.turns_taken = 0
+        return
+
+    def setup(self):
+        """Set up this bot."""
+        self.turns_taken = 0
+        return
+
+    def process(self, inputs, available_moves):
+        """Process one game turn."""
+        move = available_moves[self.turns_taken % len(available_moves)]
+        self.turns_taken += 1
+        return move
+
+    def snapshot(self):
+        """Get the number of turns taken."""
+        return self.turns_taken
+
+    def restore(self, token):
+        """Restore the number of turns taken."""
+        self.turns_taken = token
+        return
+
+
+class StatelessCountingBot(GamePlayer):
+    """Bot that plays the same moves as CountingBot, counting its turns from the board."""
+
+    def __init__(self):
+        """Create a new StatelessCountingBot."""
+        super().__init__()
+        self.deterministic = True
+        return
+
+    def process(self, inputs, available_moves):
+        """Process one game turn."""
+        # Inputs 0-8 are our positions in naughts.
+        turns_taken = int(sum(inputs[:9]))
+        return available_moves[turns_taken % len(available_moves)]
+
+
+class ResultBot(StatelessCountingBot):
+    """StatelessCountingBot that records the final board of every game it sees."""
+
+    results = []
+
+    def show_result(self, data):
+        """Record the final board."""
+        ResultBot.results.append(data.data)
+        return
+
+
+def create_test_bot(name):
+    """Create a bot, including the test bots above."""
+    return {
+        "counting": CountingBot,
+        "stateless": StatelessCountingBot,
+        "results": ResultBot,
+        "omnibot": OmniBot,
+    }[name]()
+
+
+class BatchTest(unittest.TestCase):
+    """Unit tests for Batch."""
+
+    def test_seed(self):
+        """Check batches with the same seed produce the same totals."""
+        bot_data = get_bot_data()
+        for vector in (True, False):
+            first = run_batch_shard(bot_data, get_batch_config(200, 1, vector))
+            second = run_batch_shard(bot_data, get_batch_config(200, 1, vector))
+            self.assertEqual(first, second, "Same seed, same totals")
+        return
+
+    def test_common_random(self):
+        """Check common random batches with the same seed produce the same totals."""
+        bot_data = get_bot_data()
+        for vector in (True, False):
+            batch_config = get_batch_config(200, 1, vector)
+            batch_config["common_random"] = True
+            first = run_batch_shard(bot_data, batch_config)
+            second = run_batch_shard(bot_data, batch_config)
+            self.assertEqual(first, second, "Same seed, same totals")
+        return
+
+    def test_seed_restores_random(self):
+        """Check a seeded batch leaves the global random module as it found it."""
+        for common_random in (True, False):
+            batch_config = get_batch_config(50, 1, vector=False)
+            batch_config["common_random"] = common_random
+            batch = Batch([RandomBot(), RandomBot()], batch_config)
+            batch.start_batch()
+
+            random.seed(5)
+            expected = random.random()
+
+            random.seed(5)
+            batch.run_games()
+            self.assertEqual(random.random(), expected)
+        return
+
+    def test_score_threshold(self):
+        """Check a batch stops once the bot cannot beat the score threshold."""
+        for vector in (True, False):
+            batch = Batch([RandomBot(), RandomBot()], get_batch_config(1000, 1, vector))
+            batch.set_score_threshold(0, 6.0)
+            result = batch.run_batch()
+            self.assertTrue(batch.rejected, "Batch rejected")
+            self.assertLess(batch.num_games_played, 1000, "Batch stopped early")
+            self.assertLessEqual(result.get_score("X"), 6.0, "Score cannot beat threshold")
+
+            batch = Batch([RandomBot(), RandomBot()], get_batch_config(200, 1, vector))
+            batch.set_score_threshold(0, -100.0)
+            batch.run_batch()
+            self.assertFalse(batch.rejected, "Batch not rejected")
+            self.assertEqual(batch.num_games_played, 200, "Full batch played")
+        return
+
+    def test_precision(self):
+        """Check a batch with precision set stops once the confidence interval is narrow enough."""
+        for vector in (True, False):
+            batch_config = get_batch_config(1000000, 1, vector)
+            batch_config["precision"] = 2.0
+            batch = Batch([RandomBot(), RandomBot()], batch_config)
+            batch.run_batch()
+            self.assertLess(batch.num_games_played, 1000000, "Batch stopped early")
+            for identity in batch.identities:
+                self.assertLessEqual(batch.stats.get_confidence_interval(identity), 2.0)
+        return
+
+    @mock.patch.object(BotFactory, "create_bot", lambda self, name: create_test_bot(name))
+    def test_show_result(self):
+        """Check bots see the result of every game, whether or not the batch is vectorised."""
+        bot_config = {"bot_names": ["results", "stateless"], "game": "naughts"}
+        final_boards = []
+        for vector in (True, False):
+            ResultBot.results = []
+            batch_config = {"batch_size": 20, "bot_config": bot_config, "game": "naughts"}
+            batch_config["vector"] = vector
+            bots = BotFactory(GameContext(), bot_config=bot_config).create_bots()
+            Batch(bots, batch_config).run_batch()
+            self.assertEqual(len(ResultBot.results), 20, "One result per game")
+            final_boards.append(ResultBot.results)
+        self.assertEqual(final_boards[0], final_boards[1], "Same final boards")
+        return
+
+    def test_carry_on_from_totals(self):
+        """Check a batch given earlier totals only plays the rest of its games."""
+        bot_data = get_bot_data()
+        for vector in (True, False):
+            batch_config = get_batch_config(40, 1, vector)
+            batch_config["common_random"] = True
+            first = run_batch_shard(bot_data, dict(batch_config, batch_size=20))
+
+            batch = Batch([RandomBot(), RandomBot()], dict(batch_config, totals=first))
+            batch.run_batch()
+            self.assertEqual(batch.num_games_played, 40, "Carried on to the full batch")
+
+            # The first 20 games are not played again.
+            stats = BatchStats(batch.identities, batch.stats.calculate_score)
+            stats.from_dict(first)
+            self.assertNotEqual(
+                batch.stats.outcome_counts.tolist(), (stats.outcome_counts * 2).tolist()
+            )
+            if not vector:
+                full = run_batch_shard(bot_data, batch_config)
+                self.assertEqual(batch.get_totals(), full, "Same games as one full batch")
+        return
+
+    def test_merge_totals(self):
+        """Check shard totals are added to the batch totals."""
+        bot_data = get_bot_data()
+        shards = [run_batch_shard(bot_data, get_batch_config(100, seed)) for seed in (1, 2, 3)]
+
+        batch = Batch([RandomBot(), RandomBot()], get_batch_config(300, None))
+        batch.start_batch()
+        for totals in shards:
+            batch.merge_totals(totals)
+
+        self.assertEqual(batch.num_games_played, 300)
+        self.assertEqual(batch.num_draws + sum(batch.wins.values()), 300, "Every game won or drawn")
+
+        shard_stats = []
+        for totals in shards:
+            stats = BatchStats(batch.identities, batch.stats.calculate_score)
+            stats.from_dict(totals)
+            shard_stats.append(stats)
+
+        for identity in batch.identities:
+            self.assertEqual(batch.wins[identity], sum(x.get_wins(identity) for x in shard_stats))
+            self.assertAlmostEqual(
+                batch.total_score[identity], sum(x.get_total_score(identity) for x in shard_stats)
+            )
+        return
+
+    def test_magic(self):
+        """Check merging transpositions in a magic batch gives the same totals as every game."""
+        batch = get_magic_batch(["omnibot", "naughts.simplebot"])
+        batch.run_batch()
+        self.assertEqual(batch.num_games_played, 489)
+        self.assertEqual(batch.wins, {"X": 12, "O": 350})
+        self.assertEqual(batch.num_draws, 127)
+
+        # Play the same games one at a time.
+        unmerged = get_magic_batch(["omnibot", "naughts.simplebot"])
+        start_magic_game = Batch.start_magic_game
+        with mock.patch.object(
+            Batch, "start_magic_game", lambda self: (start_magic_game(self)[0], None)
+        ):
+            unmerged.run_batch()
+        self.assertEqual(unmerged.get_totals(), batch.get_totals())
+        self.assertLess(batch.num_splits, unmerged.num_splits, "Repeated positions played once")
+
+        # Hold very few positions at a time.
+        capped = get_magic_batch(["omnibot", "naughts.simplebot"])
+        capped.magic_memory = 5
+        capped.run_batch()
+        self.assertEqual(capped.get_totals(), batch.get_totals())
+        return
+
+    def test_magic_subtrees(self):
+        """Check splitting a magic batch into subtrees gives the same totals as every game."""
+        batch = get_magic_batch(["omnibot", "naughts.simplebot"])
+        batch.run_batch()
+
+        for depth in (1, 6, 9):
+            split = get_magic_batch(["omnibot", "naughts.simplebot"])
+            split.start_batch()
+            subtrees = split.get_magic_subtrees(depth)
+            bot_data = [bot.to_dict() for bot in split.bots]
+            for subtree in subtrees:
+                split.merge_totals(run_magic_subtree(bot_data, split.batch_config, subtree))
+            self.assertEqual(split.get_totals(), batch.get_totals(), "Depth {}".format(depth))
+        return
+
+    @mock.patch.object(BotFactory, "create_bot", lambda self, name: create_test_bot(name))
+    def test_magic_snapshot(self):
+        """Check bots with state are restored before each move in a magic batch."""
+        expected = get_magic_batch(["stateless", "omnibot"])
+        expected.run_batch()
+
+        batch = get_magic_batch(["counting", "omnibot"])
+        batch.run_batch()
+        self.assertEqual(batch.get_totals(), expected.get_totals())
+
+        # The state is also carried by subtrees.
+        split = get_magic_batch(["counting", "omnibot"])
+        split.start_batch()
+        split.run_magic_subtrees(split.get_magic_subtrees(4))
+        self.assertEqual(split.get_totals(), expected.get_totals())
+        return
+
+    def test_magic_symmetric(self):
+        """Check merging symmetric positions gives the same totals as every game."""
+        batch = get_magic_batch(["omnibot", "omnibot"])
+        batch.run_batch()
+        self.assertEqual(batch.num_games_played, 255168)
+        self.assertEqual(batch.wins, {"X": 131184, "O": 77904})
+        self.assertEqual(batch.num_draws, 46080)
+        return
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Unit test for BatchStats and ResultBuffer.
+
+cd ..
+python -m unittest -v test_batchstats.py
+"""
+
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from games.naughts.singlegame import SingleGame
+from lib.batchstats import BatchStats, ResultBuffer
+
+
+def get_stats():
+    """Get empty stats for naughts."""
+    return BatchStats(SingleGame.identities, SingleGame().calculate_score)
+
+
+class BatchStatsTest(unittest.TestCase):
+    """Unit tests for BatchStats."""
+
+    def test_add_games(self):
+        """Check totals, wins and draws for a few known games."""
+        stats = get_stats()
+        buffer = ResultBuffer(stats.identities, 10)
+        buffer.add(1, {"X": 3, "O": 2})  # X wins in 3 turns: X = 7, O = -80.
+        buffer.add(2, {"X": 4, "O": 4})  # O wins in 4 turns: X = -60, O = 6.
+        buffer.add(3, {"X": 5, "O": 4})  # Draw: both 0.
+        buffer.flush(stats)
+        self.assertEqual(buffer.count, 0, "Buffer emptied")
+
+        self.assertEqual(stats.num_games, 3)
+        self.assertEqual(stats.get_wins("X"), 1)
+        self.assertEqual(stats.get_wins("O"), 1)
+        self.assertEqual(stats.get_draws(), 1)
+        self.assertEqual(stats.get_total_score("X"), -53.0)
+        self.assertEqual(stats.get_total_score("O"), -74.0)
+        self.assertEqual(stats.get_distribution("X"), [(-60.0, 1), (0.0, 1), (7.0, 1)])
+        self.assertAlmostEqual(stats.get_variance("X"), np.var([7, -60, 0], ddof=1))
+
+        histogram, edges = stats.get_histogram("O", bins=2)
+        self.assertEqual(histogram.tolist(), [1, 2])
+        self.assertEqual(len(edges), 3)
+        return
+
+    def test_merge(self):
+        """Check merged stats match stats for all the games at once."""
+        rng = np.random.default_rng(1)
+        outcomes = rng.integers(1, 4, size=100).astype(np.int8)
+        num_turns = rng.integers(3, 6, size=(100, 2)).astype(np.int16)
+
+        expected = get_stats()
+        expected.add_games(outcomes, num_turns)
+
+        merged = get_stats()
+        for start in range(0, 100, 30):
+            part = get_stats()
+            part.add_games(outcomes[start : start + 30], num_turns[start : start + 30])
+            shipped = get_stats()
+            shipped.from_dict(part.to_dict())
+            merged.merge(shipped)
+
+        self.assertEqual(merged.to_dict(), expected.to_dict())
+        return
@@ -13,7 +13,7 @@ import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
-from games.naughts.board import Board
+from games.naughts.board import SYMMETRIES, Board
 
 
 class BoardTest(unittest.TestCase):
@@ -44,3 +44,55 @@ class BoardTest(unittest.TestCase):
         rot3 = b.get_rotated_board(3)
         self.assertEqual(rot3.data, "--X-OXXOO", "get_rotated_board() with 3 rotations")
         return
+
+    def test_game_state(self):
+        """Test win/draw detection and possible moves."""
+        b = Board()
+        self.assertEqual(b.get_game_state(), 0, "Empty board is not completed")
+        self.assertEqual(b.get_possible_moves(), list(range(9)), "All moves on empty board")
+
+        b.data = "XXX-OO---"
+        self.assertEqual(b.get_game_state(), 1, "X wins top row")
+        self.assertEqual(b.get_winner(), "X", "X is the winner")
+
+        b.data = "XX-OOO--X"
+        self.assertEqual(b.get_game_state(), 2, "O wins middle row")
+        self.assertEqual(b.get_winner(), "O", "O is the winner")
+
+        b.data = "XOXXOOOXX"
+        self.assertEqual(b.get_game_state(), 3, "Full board with no winner is a draw")
+        self.assertEqual(b.get_winner(), "", "No winner for a draw")
+
+        b.data = "X--OO-OXX"
+        self.assertEqual(b.get_possible_moves(), [1, 2, 5], "get_possible_moves()")
+        self.assertEqual(b.get_first_empty_space("0452"), 5, "get_first_empty_space()")
+
+        b.setat(5, "X")
+        self.assertEqual(b.data, "X--OOXOXX", "setat() updates data")
+        self.assertEqual(b.to_dict(), {"data": "X--OOXOXX"}, "to_dict()")
+
+        c = b.copy()
+        c.setat(1, "O")
+        self.assertEqual(b.data, "X--OOXOXX", "copy() is independent of the original")
+        self.assertEqual(c.data, "XO-OOXOXX", "setat() on copy")
+        return
+
+    def test_symmetries(self):
+        """Every symmetry table matches a rotation of the board, or its mirror image."""
+        b = Board()
+        b.data = "X--OO-OXX"
+        expected = set()
+        for rotations in range(4):
+            rotated = b.get_rotated_board(rotations).data if rotations else b.data
+            expected.add(rotated)
+            expected.add("".join(rotated[row * 3 : row * 3 + 3][::-1] for row in range(3)))
+
+        transformed = set()
+        for table in SYMMETRIES:
+            t = Board()
+            t.x_bits = table[b.x_bits]
+            t.o_bits = table[b.o_bits]
+            transformed.add(t.data)
+        self.assertEqual(transformed, expected, "8 distinct symmetries")
+        self.assertEqual(len(transformed), 8)
+        return
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Unit test for ProgressReporter.
+
+cd ..
+python -m unittest -v test_progress.py
+"""
+
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from lib.progress import ProgressReporter
+
+
+class ProgressReporterTest(unittest.TestCase):
+    """Unit test for ProgressReporter."""
+
+    def test_rate_limit(self):
+        """Check reports are only due once per interval."""
+        log = mock.Mock(is_enabled=True)
+        with mock.patch("lib.progress.time.monotonic", return_value=100.0) as monotonic:
+            progress = ProgressReporter(max_rate=2.0)
+            progress.start(log)
+            self.assertFalse(progress.is_due())
+
+            monotonic.return_value = 100.5
+            self.assertTrue(progress.is_due())
+            progress.report(1000, 10, 200, 0.25)
+            self.assertFalse(progress.is_due(), "Not due again until the next interval")
+
+            monotonic.return_value = 101.0
+            self.assertTrue(progress.is_due())
+
+        log.info.assert_called_once_with(
+            "Progress: 1000 states expanded, frontier 10, 400 leaves/sec, 25.0% done, ETA 0:00:02"
+        )
+        return
+
+    def test_disabled(self):
+        """Check reports are never due if the log is not enabled."""
+        log = mock.Mock(is_enabled=False)
+        with mock.patch("lib.progress.time.monotonic", return_value=100.0) as monotonic:
+            progress = ProgressReporter()
+            progress.start(log)
+            monotonic.return_value = 1000000.0
+            self.assertFalse(progress.is_due())
+        return
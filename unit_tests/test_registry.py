@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Unit test for the bot and game class registry.
+
+cd ..
+python -m unittest -v test_registry.py
+"""
+
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from bots.randombot.randombot import RandomBot
+from games.naughts.bots.minimaxbot.minimaxbot import MinimaxBot
+from games.naughts.singlegame import SingleGame
+from lib import registry
+from lib.errors import BotCreateError
+
+
+class RegistryTest(unittest.TestCase):
+    """Unit tests for lib.registry."""
+
+    def test_lookup(self):
+        """Test bot and game names resolve to the right classes."""
+        self.assertIs(registry.get_bot_class("randombot"), RandomBot)
+        self.assertIs(registry.get_bot_class("naughts.minimaxbot"), MinimaxBot)
+        self.assertIs(registry.get_game_class("naughts"), SingleGame)
+        with self.assertRaises(BotCreateError):
+            registry.get_bot_class("nosuchbot")
+        return
+
+    def test_vector_game_class(self):
+        """Test a missing vectorgame module means no vectorised game, but other errors are raised."""
+        missing = ModuleNotFoundError("No module", name="games.naughts.vectorgame")
+        registry._vector_game_classes.pop("naughts", None)
+        with mock.patch("importlib.import_module", side_effect=missing):
+            self.assertIsNone(registry.get_vector_game_class("naughts"))
+
+        broken = ModuleNotFoundError("No module", name="missingdep")
+        registry._vector_game_classes.pop("naughts", None)
+        with mock.patch("importlib.import_module", side_effect=broken):
+            with self.assertRaises(ModuleNotFoundError):
+                registry.get_vector_game_class("naughts")
+
+        registry._vector_game_classes.pop("naughts", None)
+        self.assertIsNotNone(registry.get_vector_game_class("naughts"))
+        return
+
+    def test_manifest(self):
+        """Test the manifest lists every bot, and can be loaded back."""
+        manifest = registry.generate_manifest()
+        self.assertEqual(
+            manifest["bots"]["naughts.minimaxbot"],
+            "games.naughts.bots.minimaxbot.minimaxbot:MinimaxBot",
+        )
+        self.assertIn("connect4", manifest["games"])
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "manifest.json")
+            registry.write_manifest(path)
+            registry._bot_classes.clear()
+            self.assertTrue(registry.load_manifest(path))
+
+        self.assertIs(registry._bot_classes["naughts.minimaxbot"], MinimaxBot)
+        self.assertFalse(registry.load_manifest(os.path.join(temp_dir, "missing.json")))
+        return
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Unit test for the SingleGame make_move() / unmake_move() API.
+
+cd ..
+python -m unittest -v test_singlegame.py
+"""
+
+
+import copy
+import random
+import unittest
+from unittest import mock
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from bots.randombot.randombot import RandomBot
+from games.connect4.singlegame import SingleGame as Connect4Game
+from games.naughts.singlegame import SingleGame as NaughtsGame
+
+
+class SingleGameTest(unittest.TestCase):
+    """Unit tests for make_move() and unmake_move()."""
+
+    def check_make_unmake(self, class_):
+        """Play random games, then unwind them and check every state is restored."""
+        for _ in range(50):
+            game = class_()
+            game.set_initial_state()
+            game.start([RandomBot(), RandomBot()])
+
+            history = []
+            while not game.is_ended():
+                state = copy.deepcopy(game.to_dict())
+                inputs = {k: list(v) for k, v in game.input_buffers.items()}
+                history.append((state, inputs))
+                game.make_move(random.choice(game.get_inputs(game.current_identity)[1]))
+
+            while history:
+                state, inputs = history.pop()
+                game.unmake_move()
+                self.assertEqual(game.to_dict(), state, "State restored by unmake_move()")
+                self.assertFalse(game.is_ended(), "Game not ended after unmake_move()")
+                for identity, buffer in game.input_buffers.items():
+                    self.assertEqual(list(buffer), inputs[identity], "Inputs restored")
+        return
+
+    def test_inputs(self):
+        """Check bots cannot change the game's inputs or available moves."""
+        for class_ in (NaughtsGame, Connect4Game):
+            game = class_()
+            game.set_initial_state()
+            game.start([RandomBot(), RandomBot()])
+            identity = game.current_identity
+
+            inputs, moves = game.get_inputs(identity)
+            if class_ is NaughtsGame:
+                self.assertIsInstance(moves, tuple, "Naughts moves are immutable")
+            with self.assertRaises(TypeError):
+                inputs[0] = 1.0
+
+            # Without read-only views (Python < 3.8), bots get a list that is
+            # kept in step with the buffer instead.
+            with mock.patch("lib.gamebase.READONLY_VIEWS", False):
+                game = class_()
+            game.set_initial_state()
+            game.start([RandomBot(), RandomBot()])
+            inputs = game.get_inputs(identity)[0]
+            while not game.is_ended():
+                game.make_move(game.get_inputs(game.current_identity)[1][0])
+                for other_identity, buffer in game.input_buffers.items():
+                    other_inputs = game.get_inputs(other_identity)[0]
+                    self.assertEqual(other_inputs, list(buffer), "Inputs in step with buffer")
+
+            self.assertIs(game.get_inputs(identity)[0], inputs, "Same list every turn")
+            inputs[0] = 1.0 - inputs[0]
+            self.assertNotEqual(game.input_buffers[identity][0], inputs[0], "Buffer unchanged")
+        return
+
+    def test_reuse(self):
+        """Check a finished game object and its bots can be reused for a new game."""
+        bots = [RandomBot(), RandomBot()]
+        game = NaughtsGame()
+        fresh_state = None
+        for _ in range(3):
+            game.set_initial_state()
+            for bot in bots:
+                bot.reset_for_game()
+            game.start(bots)
+            if fresh_state is None:
+                fresh_state = copy.deepcopy(game.to_dict())
+
+            self.assertEqual(game.to_dict(), fresh_state, "Game restarted from scratch")
+            for buffer in game.input_buffers.values():
+                self.assertFalse(any(buffer), "Inputs cleared")
+            game.run()
+        return
+
+    def test_naughts(self):
+        """Test make_move() and unmake_move() for naughts."""
+        self.check_make_unmake(NaughtsGame)
+        return
+
+    def test_connect4(self):
+        """Test make_move() and unmake_move() for Connect 4."""
+        self.check_make_unmake(Connect4Game)
+        return
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Unit test for the naughts state table.
+
+cd ..
+python -m unittest -v test_statetable.py
+"""
+
+
+import unittest
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from games.naughts.board import SEQUENCES, Board
+from games.naughts.statetable import STATE_TABLE, get_bits, get_entry
+
+
+class StateTableTest(unittest.TestCase):
+    """Basic unit tests for games.naughts.statetable."""
+
+    def test_reachable(self):
+        """Every reachable position must match the Board."""
+        self.assertEqual(sum(1 for x in STATE_TABLE if x is not None), 5478, "Reachable count")
+
+        canonical_keys = set()
+        for key, entry in enumerate(STATE_TABLE):
+            if entry is None:
+                continue
+
+            b = Board()
+            b.data = "".join("-XO"[(key // 3**pos) % 3] for pos in range(9))
+            self.assertEqual(b.get_key(), key, "Board key")
+            self.assertEqual(get_bits(key), (b.x_bits, b.o_bits), "Bits from key")
+            self.assertEqual(entry.state, b.get_game_state(), "Game state")
+            self.assertEqual(entry.winner, b.get_winner(), "Winner")
+            self.assertEqual(list(entry.moves), b.get_possible_moves(), "Possible moves")
+            canonical_keys.add(entry.canonical_key)
+
+            for rotations in range(4):
+                rotated = get_entry(b.get_rotated_board(rotations))
+                self.assertEqual(rotated.canonical_key, entry.canonical_key, "Canonical key")
+
+            for identity in ("X", "O"):
+                inputs = entry.get_inputs(identity)
+                for pos in range(9):
+                    c = b.getat(pos)
+                    self.assertEqual(inputs[pos], 1.0 if c == identity else 0.0, "Our inputs")
+                    self.assertEqual(
+                        inputs[pos + 9], 1.0 if c not in (identity, " ") else 0.0, "Their inputs"
+                    )
+
+                expected = []
+                for seq in SEQUENCES:
+                    contents = b.getat_multi(seq)
+                    if contents.count(identity) == 2 and contents.count(" ") == 1:
+                        move = int(seq[contents.index(" ")])
+                        if move not in expected:
+                            expected.append(move)
+                self.assertEqual(list(entry.get_winning_moves(identity)), expected, "Win moves")
+
+        self.assertEqual(len(canonical_keys), 765, "Number of distinct positions by symmetry")
+        return
+
+    def test_unreachable(self):
+        """Unreachable positions are built on demand."""
+        b = Board()
+        b.data = "XXXXXXXXX"
+        self.assertIsNone(STATE_TABLE[b.get_key()], "Unreachable entry not built up front")
+        self.assertEqual(get_entry(b).state, 1, "Unreachable entry built on demand")
+        self.assertIsNotNone(STATE_TABLE[b.get_key()], "Unreachable entry cached")
+        return
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Unit test for the vectorised games and GamePlayer.process_batch().
+
+cd ..
+python -m unittest -v test_vectorgame.py
+"""
+
+
+import random
+import unittest
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from bots.genbot3.genbot3 import GenBot3
+from bots.nbot1.nbot1 import NBot1
+from bots.randombot.randombot import RandomBot
+from games.connect4.vectorgame import VectorGame as Connect4VectorGame
+from games.connect4.world import World
+from games.naughts.board import Board
+from games.naughts.bots.simplebot.simplebot import SimpleBot
+from games.naughts.singlegame import SingleGame
+from games.naughts.vectorgame import VectorGame
+
+
+class VectorGameTest(unittest.TestCase):
+    """Unit tests for VectorGame."""
+
+    def test_naughts_random_games(self):
+        """Play random games and check every final board with Board."""
+        game = VectorGame(2000)
+        game.run([RandomBot(), RandomBot()])
+
+        for data, outcome, num_turns in zip(game.boards, game.outcomes, game.num_turns):
+            board = Board()
+            board.data = "".join("-XO"[x] for x in data)
+            self.assertEqual(board.get_game_state(), outcome, "Outcome matches Board")
+            self.assertEqual(board.data.count("X"), num_turns[0], "X turns")
+            self.assertEqual(board.data.count("O"), num_turns[1], "O turns")
+        return
+
+    def test_connect4_random_games(self):
+        """Play random Connect 4 games and check every final world with World."""
+        game = Connect4VectorGame(500)
+        game.run([RandomBot(), RandomBot()])
+
+        for data, outcome, num_turns in zip(game.worlds, game.outcomes, game.num_turns):
+            world = World()
+            world.data = ["".join(" XO"[x] for x in row) for row in data]
+            self.assertEqual(world.get_game_state(), outcome, "Outcome matches World")
+            self.assertEqual(bin(world.x_bits).count("1"), num_turns[0], "X turns")
+            self.assertEqual(bin(world.o_bits).count("1"), num_turns[1], "O turns")
+        return
+
+    def test_deterministic_bot(self):
+        """Check a deterministic bot plays the same game as in SingleGame."""
+        bots = [SimpleBot(), SimpleBot()]
+        for identity, bot in zip(SingleGame.identities, bots):
+            bot.identity = identity
+
+        game = VectorGame(10)
+        game.run(bots)
+
+        single_game = SingleGame()
+        single_game.set_initial_state()
+        single_game.start([SimpleBot(), SimpleBot()])
+        single_game.run()
+
+        for data in game.boards:
+            board = Board()
+            board.data = "".join("-XO"[x] for x in data)
+            self.assertEqual(board.data, single_game.game_board.data, "Same final board")
+        return
+
+    def check_process_batch(self, bot, input_count, output_count):
+        """Check process_batch() chooses the same moves as process()."""
+        rng = np.random.default_rng(1)
+        inputs = (rng.random((200, input_count)) > 0.5).astype(np.float64)
+        legal_mask = rng.random((200, output_count)) > 0.3
+        legal_mask[:, 0] = True
+        moves = bot.process_batch(inputs, legal_mask)
+
+        for row, legal, move in zip(inputs, legal_mask, moves):
+            expected = bot.process(row.tolist(), np.flatnonzero(legal).tolist())
+            self.assertEqual(move, expected, "process_batch() matches process()")
+        return
+
+    def test_nbot1(self):
+        """Test NBot1.process_batch()."""
+        bot = NBot1()
+        bot.create({"input_count": 18, "output_count": 9})
+        self.check_process_batch(bot, 18, 9)
+        return
+
+    def test_genbot3(self):
+        """Test GenBot3.process_batch(), including after mutation."""
+        random.seed(3)
+        bot = GenBot3()
+        bot.create({"input_count": 98, "output_count": 7})
+        self.check_process_batch(bot, 98, 7)
+        for _ in range(10):
+            bot.mutate()
+        self.check_process_batch(bot, 98, 7)
+        return
+
+    def test_random_bot(self):
+        """Check RandomBot.process_batch() only chooses legal moves."""
+        rng = np.random.default_rng(1)
+        legal_mask = rng.random((1000, 9)) > 0.5
+        legal_mask[:, 8] = True
+        moves = RandomBot().process_batch(np.zeros((1000, 18)), legal_mask)
+        self.assertTrue(legal_mask[np.arange(1000), moves].all(), "Only legal moves")
+        return
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Unit test for the Connect 4 world.
+
+cd ..
+python -m unittest -v test_world.py
+"""
+
+
+import random
+import unittest
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from games.connect4.world import World, mirror_bits
+
+
+class WorldTest(unittest.TestCase):
+    """Basic unit tests for games.connect4.world.World."""
+
+    def test_world(self):
+        """Various unit tests for World."""
+        w = World()
+        self.assertEqual(w.get_possible_moves(), list(range(7)), "All moves on empty world")
+
+        w.setat(3, "X")
+        w.setat(3, "O")
+        w.setat(0, "X")
+        self.assertEqual(w.getat(3, 0), "X", "First piece lands on the bottom row")
+        self.assertEqual(w.getat(3, 1), "O", "Second piece lands on top of the first")
+        self.assertEqual(w.getat(3, 2), " ", "Empty cell")
+        self.assertEqual(w.data[0], "X  X   ", "Bottom row data")
+        self.assertEqual(w.data[1], "   O   ", "Second row data")
+
+        w2 = World()
+        w2.from_dict(w.to_dict())
+        self.assertEqual(w2.data, w.data, "from_dict(to_dict())")
+        w2.setat(3, "X")
+        self.assertEqual(w2.heights[3], 3, "Column height after load and drop")
+        self.assertEqual(w.heights[3], 2, "Original unchanged after loading a copy")
+
+        for _ in range(7):
+            w.setat(6, "O")
+        self.assertEqual(w.get_possible_moves(), [0, 1, 2, 3, 4, 5], "Full column")
+        return
+
+    def test_game_state(self):
+        """Test win detection in every direction."""
+        w = World()
+        for col in range(3):
+            w.setat(col, "X")
+        self.assertEqual(w.get_game_state(), 0, "Three in a row is not a win")
+        w.setat(3, "X")
+        self.assertEqual(w.get_game_state(), 1, "X wins horizontally")
+
+        w = World()
+        for _ in range(4):
+            w.setat(5, "O")
+        self.assertEqual(w.get_game_state(), 2, "O wins vertically")
+        self.assertEqual(w.get_winner(), "O", "O is the winner")
+
+        # No wrap-around between the top of one column and the next.
+        w = World()
+        w.setat_raw(0, 5, "X")
+        w.setat_raw(0, 6, "X")
+        w.setat_raw(1, 0, "X")
+        w.setat_raw(1, 1, "X")
+        self.assertEqual(w.get_game_state(), 0, "Vertical check must not wrap columns")
+
+        # Diagonal, up and to the right.
+        w = World()
+        w.data = ["XOOO   ", " XOO   ", "  XO   ", "   X   ", "       ", "       ", "       "]
+        self.assertEqual(w.get_game_state(), 1, "X wins diagonally up-right")
+
+        # Diagonal, up and to the left.
+        w = World()
+        w.data = ["   XOXO", "   XXO ", "   XO  ", "   O   ", "       ", "       ", "       "]
+        self.assertEqual(w.get_game_state(), 2, "O wins diagonally up-left")
+
+        # Full stand with no winner.
+        w = World()
+        w.data = ["XXOOXXO", "OOXXOOX", "XXOOXXO", "OOXXOOX", "XXOOXXO", "OOXXOOX", "XXOOXXO"]
+        self.assertEqual(w.get_game_state(), 3, "Full stand is a draw")
+        return
+
+    def test_incremental_state(self):
+        """Incremental state from the last move must match a full scan."""
+        for _ in range(200):
+            w = World()
+            turn = "X"
+            while not w.is_ended():
+                w.setat(random.choice(w.get_possible_moves()), turn)
+                turn = "O" if turn == "X" else "X"
+                self.assertEqual(w.get_game_state(), w.scan_game_state(), "Incremental state")
+
+            self.assertEqual(w.num_pieces, sum(w.heights), "Piece count")
+            loaded = World()
+            loaded.from_dict(w.to_dict())
+            self.assertEqual(loaded.get_game_state(), w.get_game_state(), "State after load")
+        return
+
+    def test_mirror(self):
+        """Mirroring the bitboards mirrors every row."""
+        w = World()
+        w.data = ["XO     ", "X      ", "       ", "       ", "       ", "       ", "       "]
+        mirrored = World()
+        mirrored.x_bits = mirror_bits(w.x_bits)
+        mirrored.o_bits = mirror_bits(w.o_bits)
+        self.assertEqual(mirrored.data, [row[::-1] for row in w.data], "Mirrored rows")
+        return